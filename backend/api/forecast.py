@@ -8,15 +8,25 @@ from typing import Optional, List
 from datetime import datetime, timezone
 from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
 
-from core.database.raindrop_db import get_forecast_by_station, get_all_forecasts
+import numpy as np
+
+from core.database.raindrop_db import (
+    RISK_LEVELS,
+    get_forecast_by_station,
+    get_all_forecasts,
+    get_forecast_matrix,
+)
 from services import Predictor
-from config import STATIONS
+from config import STATIONS, IO_WORKERS, station as find_station
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Código del nivel RED dentro de risk_bits
+RED_LEVEL = RISK_LEVELS.index("RED")
+
 # Instancia global del modelo ML (se carga una sola vez)
 _risk_predictor_instance = None
 
@@ -176,9 +186,10 @@ async def get_forecast_summary(
         Resumen con conteo de estaciones en riesgo por día
     """
     try:
-        all_forecasts = get_all_forecasts(days)
+        # Resumen numérico: arreglo estructurado en lugar de un dict por pronóstico
+        forecasts = get_forecast_matrix(days=days)
         
-        if not all_forecasts:
+        if not forecasts.size:
             # Ejecutar pipeline en segundo plano
             background_tasks.add_task(run_forecast_pipeline_background)
             return {
@@ -188,41 +199,39 @@ async def get_forecast_summary(
                 "message": "Generando pronósticos en segundo plano..."
             }
         
-        # Crear resumen por día
-        daily_summary = {}
+        # Leer riesgos pre-calculados (ya no calcular) desde risk_bits
+        bits = forecasts["risk_bits"]
+        flood_alert = (bits >> 4) & 1
+        drought_alert = (bits >> 9) & 1
+        flood_red = (bits & 0xF) == RED_LEVEL
+        drought_red = ((bits >> 5) & 0xF) == RED_LEVEL
         
-        for station_id, forecasts in all_forecasts.items():
-            for day_forecast in forecasts:
-                date = day_forecast.get("forecast_date")
-                
-                if date not in daily_summary:
-                    daily_summary[date] = {
-                        "date": date,
-                        "flood_alerts": 0,
-                        "drought_alerts": 0,
-                        "high_flood_risk": 0,
-                        "high_drought_risk": 0,
-                    }
-                
-                # Leer riesgos pre-calculados (ya no calcular)
-                risk_data = get_risk_from_forecast_data(day_forecast)
-                
-                if risk_data["flood_risk"]["alert"]:
-                    daily_summary[date]["flood_alerts"] += 1
-                if risk_data["drought_risk"]["alert"]:
-                    daily_summary[date]["drought_alerts"] += 1
-                
-                if risk_data["flood_risk"]["level"] == "RED":
-                    daily_summary[date]["high_flood_risk"] += 1
-                if risk_data["drought_risk"]["level"] == "RED":
-                    daily_summary[date]["high_drought_risk"] += 1
+        # Crear resumen por día (np.unique devuelve las fechas ordenadas)
+        dates, day_index = np.unique(forecasts["forecast_date"], return_inverse=True)
         
-        # Convertir a lista ordenada
-        summary_list = sorted(daily_summary.values(), key=lambda x: x["date"])
+        def count_by_day(mask):
+            return np.bincount(day_index, weights=mask, minlength=len(dates)).astype(int).tolist()
+        
+        summary_list = [
+            {
+                "date": date,
+                "flood_alerts": flood_alerts,
+                "drought_alerts": drought_alerts,
+                "high_flood_risk": high_flood,
+                "high_drought_risk": high_drought,
+            }
+            for date, flood_alerts, drought_alerts, high_flood, high_drought in zip(
+                dates.tolist(),
+                count_by_day(flood_alert),
+                count_by_day(drought_alert),
+                count_by_day(flood_red),
+                count_by_day(drought_red),
+            )
+        ]
         
         return {
             "forecast_days": len(summary_list),
-            "total_stations": len(all_forecasts),
+            "total_stations": len(np.unique(forecasts["station_id"])),
             "daily_summary": summary_list,
         }
         
@@ -250,7 +259,7 @@ async def get_station_forecast(
     """
     try:
         # Verificar que la estación existe
-        station = next((s for s in STATIONS if s["id"] == station_id), None)
+        station = find_station(station_id)
         if not station:
             raise HTTPException(status_code=404, detail=f"Estación {station_id} no encontrada")
         
@@ -380,8 +389,8 @@ async def get_all_stations_forecast(
         
         stations_forecast = {}
         
-        # Usar ThreadPoolExecutor para procesamiento paralelo (hasta 20 threads para más rapidez)
-        with ThreadPoolExecutor(max_workers=20) as executor:
+        # Usar ThreadPoolExecutor para procesamiento paralelo (dimensionado según CPUs disponibles)
+        with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
             # Enviar todas las estaciones al pool
             future_to_station = {executor.submit(process_station, station): station for station in STATIONS}
             
@@ -13,7 +13,8 @@ from core.database.raindrop_db import (
     insert_incident_report,
     get_active_incident_reports,
     get_all_incident_reports,
-    update_incident_status
+    update_incident_status,
+    delete_incident_report as db_delete_incident_report
 )
 
 router = APIRouter()
@@ -210,17 +211,7 @@ async def update_incident_report(
 async def delete_incident_report(incident_id: int):
     """Elimina un reporte de incidencia."""
     try:
-        from core.database.raindrop_db import DATABASE_PATH
-        import sqlite3
-        
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute("DELETE FROM incident_reports WHERE id = ?", (incident_id,))
-        deleted = cursor.rowcount > 0
-        
-        conn.commit()
-        conn.close()
+        deleted = db_delete_incident_report(incident_id)
         
         if not deleted:
             raise HTTPException(
@@ -162,7 +162,7 @@ async def get_model_info():
         
         return {
             "status": "trained",
-            "model_type": "Dual RandomForestRegressor (flood + drought)",
+            "model_type": "Dual HistGradientBoostingRegressor (flood + drought)",
             "features": model_data['feature_names'],
             "output_format": {
                 "flood_risk": "float [0.0 - 1.0]",
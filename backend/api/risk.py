@@ -6,7 +6,22 @@ from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
 import logging
 
-from core.analysis.risk_analyzer import analyze_and_save_risk, RiskAnalyzer
+from core.analysis.risk_analyzer import (
+    analyze_and_save_risk,
+    analysis_to_dict,
+    format_trends,
+    get_risk_analyzer,
+    get_active_station_ids,
+    RiskAnalyzer
+)
+from config import station
+
+try:
+    # orjson (opcional) serializa la respuesta en C sin pasar por jsonable_encoder
+    from fastapi.responses import ORJSONResponse
+    import orjson  # noqa: F401
+except ImportError:
+    ORJSONResponse = None
 
 router = APIRouter(prefix="/api/risk", tags=["risk"])
 logger = logging.getLogger(__name__)
@@ -16,9 +31,8 @@ logger = logging.getLogger(__name__)
 async def analyze_risk(
     station_id: Optional[int] = Query(
         None, 
-        description="ID de estación específica (1-15), o None para todas",
-        ge=1,
-        le=15
+        description="ID de estación específica, o None para todas",
+        ge=1
     ),
     hours: int = Query(
         24,
@@ -30,16 +44,23 @@ async def analyze_risk(
     """
     Analiza el riesgo climático basado en datos históricos.
     
-    - **station_id**: ID de estación específica (1-15), o omitir para analizar todas
+    - **station_id**: ID de estación específica, o omitir para analizar todas
     - **hours**: Horas de histórico para comparar (default: 24)
     
     Returns:
         Análisis de riesgo con nivel, score, factores y recomendaciones
     """
     try:
-        analyzer = RiskAnalyzer()
+        analyzer = get_risk_analyzer()
         
         if station_id:
+            # Mismas estaciones que el análisis de todas: configuradas o con datos en la BD
+            if station(station_id) is None and station_id not in get_active_station_ids():
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Estación {station_id} no encontrada"
+                )
+            
             # Análisis de una estación específica
             analysis = analyzer.analyze_station_risk(station_id, hours)
             
@@ -49,23 +70,15 @@ async def analyze_risk(
                     detail=f"No hay datos suficientes para la estación {station_id}"
                 )
             
-            return {
-                'station_id': analysis.station_id,
-                'station_name': analysis.station_name,
-                'timestamp': analysis.timestamp,
-                'risk_level': analysis.risk_level.value,
-                'risk_score': analysis.risk_score,
-                'factors': analysis.factors,
-                'trends': analysis.trends,
-                'recommendations': analysis.recommendations,
-                'current_metrics': analysis.current_metrics,
-                'historical_avg': analysis.historical_avg
-            }
+            result = analysis_to_dict(analysis)
         else:
             # Análisis de todas las estaciones
             result = analyze_and_save_risk()
-            return result
+        
+        return ORJSONResponse(result) if ORJSONResponse is not None else result
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error analizando riesgo: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -110,7 +123,7 @@ async def get_station_risk_history(
     """
     Obtiene el histórico de análisis de riesgo para una estación.
     
-    - **station_id**: ID de la estación (1-15)
+    - **station_id**: ID de la estación
     - **hours**: Horas de histórico (default: 24)
     
     Returns:
@@ -129,7 +142,7 @@ async def get_station_risk_history(
             )
         
         # Analizar riesgo actual
-        analyzer = RiskAnalyzer()
+        analyzer = get_risk_analyzer()
         current_analysis = analyzer.analyze_station_risk(station_id, hours)
         
         # Preparar respuesta con histórico
@@ -150,9 +163,9 @@ async def get_station_risk_history(
             'station_id': station_id,
             'station_name': historical_data[0].get('station_name'),
             'current_analysis': {
-                'risk_level': current_analysis.risk_level.value if current_analysis else 'unknown',
+                'risk_level': current_analysis.risk_level if current_analysis else 'unknown',
                 'risk_score': current_analysis.risk_score if current_analysis else 0,
-                'trends': current_analysis.trends if current_analysis else {}
+                'trends': format_trends(current_analysis.trends) if current_analysis else {}
             } if current_analysis else None,
             'history': history,
             'hours_analyzed': len(history)
@@ -4,6 +4,7 @@ API router para endpoints de estaciones respaldados por los servicios
 
 from datetime import datetime
 import logging
+import os
 from typing import Optional, List
 
 import pandas as pd
@@ -11,13 +12,11 @@ from fastapi import APIRouter, HTTPException
 
 from services import Predictor, RiskCalculator
 from core.ml.risk_predictor import RiskPredictor
-from config import STATIONS, DATA_CLEAN_PATH
+from config import STATIONS, MASTER_DATASET_PATH, station as find_station
 from pathlib import Path
 from core.database.raindrop_db import (
     get_all_stations_latest, 
     get_latest_data_by_station,
-    upsert_alert,
-    remove_alert,
     get_station_alert,
     get_all_alerts_by_station
 )
@@ -44,14 +43,14 @@ def get_risk_predictor():
 
 def _get_station_info(station_id: int) -> Optional[dict]:
     """Obtiene la metadata de la estación desde la configuración."""
-    return next((s for s in STATIONS if s.get("id") == station_id), None)
+    return find_station(station_id)
 
 
 def _get_current_conditions(station_id: int) -> dict:
     """Lee condiciones recientes desde el dataset limpio, con tolerancia a esquemas."""
     try:
-        file_path = DATA_CLEAN_PATH / "master_dataset_final.csv"
-        if not file_path.exists():
+        file_path = MASTER_DATASET_PATH
+        if not os.path.exists(file_path):
             raise FileNotFoundError()
 
         df = pd.read_csv(file_path)
@@ -87,31 +86,6 @@ def _get_current_conditions(station_id: int) -> dict:
         }
 
 
-def _manage_alert(station_id: int, station_name: str, alert_type: str, 
-                  probability: float, risk_level: str) -> None:
-    """
-    Gestiona automáticamente las alertas basándose en la probabilidad.
-    - Si probabilidad >= 50%: Crea/actualiza alerta
-    - Si probabilidad < 51%: Elimina alerta si existe
-    
-    Args:
-        station_id: ID de la estación
-        station_name: Nombre de la estación
-        alert_type: 'flood' o 'drought'
-        probability: Probabilidad del riesgo (0.0 - 1.0)
-        risk_level: Nivel de riesgo (GREEN, YELLOW, RED)
-    """
-    try:
-        if probability >= 0.50:
-            # Crear o actualizar alerta
-            upsert_alert(station_id, station_name, alert_type, risk_level, probability)
-        else:
-            # Eliminar alerta si existe
-            remove_alert(station_id, alert_type)
-    except Exception as e:
-        logger.warning(f"Error gestionando alerta para estación {station_id}: {e}")
-
-
 @router.get("")
 async def list_all_stations():
     """Retorna listado de estaciones con riesgo actual basado en datos reales de Meteosource."""
@@ -296,8 +270,8 @@ async def get_station_history(station_id: int, days: int = 30, variable: Optiona
         if not station_info:
             raise HTTPException(status_code=404, detail=f"Estación {station_id} no encontrada")
 
-        file_path = DATA_CLEAN_PATH / "master_dataset_final.csv"
-        if not file_path.exists():
+        file_path = MASTER_DATASET_PATH
+        if not os.path.exists(file_path):
             return {"station_id": station_id, "station_name": station_info.get("name"), "days": days, "data": []}
 
         df = pd.read_csv(file_path)
@@ -586,7 +560,7 @@ async def get_active_alerts(alert_type: Optional[str] = None):
         Lista de alertas activas con timestamps reales
     """
     try:
-        from core.database.weather_db import get_active_alerts
+        from core.database.raindrop_db import get_active_alerts
         
         alerts = get_active_alerts(alert_type)
         
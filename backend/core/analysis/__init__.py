@@ -2,16 +2,46 @@
 Módulo de análisis de riesgo climático
 """
 
-from .risk_analyzer import (
-    RiskAnalyzer,
-    RiskLevel,
-    RiskAnalysis,
-    analyze_and_save_risk
-)
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .risk_analyzer import (
+        RiskAnalyzer,
+        RiskLevel,
+        RiskAnalysis,
+        analyze_and_save_risk,
+        get_risk_analyzer
+    )
+
+# Nombre exportado -> submódulo que lo define (se importa en el primer acceso)
+_LAZY = {
+    'RiskAnalyzer': 'risk_analyzer',
+    'RiskLevel': 'risk_analyzer',
+    'RiskAnalysis': 'risk_analyzer',
+    'analyze_and_save_risk': 'risk_analyzer',
+    'get_risk_analyzer': 'risk_analyzer',
+}
 
 __all__ = [
     'RiskAnalyzer',
     'RiskLevel',
     'RiskAnalysis',
-    'analyze_and_save_risk'
+    'analyze_and_save_risk',
+    'get_risk_analyzer'
 ]
+
+
+def __getattr__(name):
+    """Carga perezosa de los exportados del paquete (PEP 562)."""
+    if name in _LAZY:
+        module = importlib.import_module(f".{_LAZY[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """Lista los exportados sin importar risk_analyzer."""
+    return sorted(set(globals()) | set(__all__))
@@ -3,30 +3,155 @@ Analizador de Riesgo Climático
 Compara métricas actuales con históricas y predice nivel de riesgo
 """
 
+import time
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional
+from functools import lru_cache
+from operator import attrgetter
+from typing import Dict, List, Literal, Optional, Tuple
 import logging
 from dataclasses import dataclass
-from enum import Enum
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba es opcional: sin él se usa la versión NumPy
+    njit = None
 
 logger = logging.getLogger(__name__)
 
+# Métricas analizadas (orden de las columnas en las matrices de valores)
+METRICS = ('temperature', 'humidity', 'precipitation_total', 'wind_speed', 'pressure')
+
+
+def _build_score_tables(thresholds: Dict) -> tuple:
+    """
+    Tablas de clasificación por métrica (en el orden de METRICS) para np.searchsorted.
+    
+    Cada tabla: (nombre del factor, bordes, lado, score por tramo, severidad por tramo,
+    mensaje por tramo). El tramo es el número de bordes superados por el valor.
+    """
+    t = thresholds
+    return (
+        ('temperature',
+         np.array([t['temperature']['normal_max'], t['temperature']['high'], t['temperature']['critical']]),
+         'right', np.array([0, 40, 70, 90]),
+         ('normal', 'moderate', 'high', 'critical'),
+         ("Temperatura: {}°C", "Temperatura sobre el promedio: {}°C",
+          "Temperatura alta: {}°C", "Temperatura crítica: {}°C")),
+        ('humidity',
+         np.array([t['humidity']['normal_min'], t['humidity']['high'], t['humidity']['critical']]),
+         'right', np.array([30, 0, 60, 80]),
+         ('moderate', 'normal', 'high', 'critical'),
+         ("Humedad baja: {}%", "Humedad: {}%", "Humedad muy alta: {}%", "Humedad crítica: {}%")),
+        # Primer borde: menor float positivo (cualquier lluvia > 0 es "ligera")
+        ('precipitation',
+         np.array([np.nextafter(0.0, 1.0), t['precipitation_total']['moderate'],
+                   t['precipitation_total']['high'], t['precipitation_total']['critical']]),
+         'right', np.array([0, 20, 50, 75, 95]),
+         ('normal', 'low', 'moderate', 'high', 'critical'),
+         ("Precipitación: {}mm", "Lluvia ligera: {}mm/h", "Lluvia moderada: {}mm/h",
+          "Lluvia intensa: {}mm/h", "Lluvia crítica: {}mm/h")),
+        ('wind',
+         np.array([t['wind_speed']['moderate'], t['wind_speed']['high'], t['wind_speed']['critical']]),
+         'right', np.array([0, 40, 65, 85]),
+         ('normal', 'moderate', 'high', 'critical'),
+         ("Viento: {} km/h", "Vientos moderados: {} km/h", "Vientos fuertes: {} km/h",
+          "Vientos peligrosos: {} km/h")),
+        # Presión: menor es peor (<= low_critical, <= low_warning, < normal_min)
+        ('pressure',
+         np.array([t['pressure']['low_critical'], t['pressure']['low_warning'],
+                   np.nextafter(t['pressure']['normal_min'], -np.inf)]),
+         'left', np.array([80, 55, 30, 0]),
+         ('critical', 'high', 'moderate', 'normal'),
+         ("Presión muy baja: {} hPa (tormenta posible)", "Presión baja: {} hPa",
+          "Presión bajo el promedio: {} hPa", "Presión: {} hPa")),
+    )
+
+def _pack_score_tables(tables: tuple) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Empaqueta las tablas en arreglos densos para el kernel compilado.
+    
+    Returns:
+        Tuple (bordes (M, E) rellenos con inf, número de bordes (M,),
+        lado izquierdo (M,) bool, scores por tramo (M, E + 1))
+    """
+    width = max(len(edges) for _, edges, _, _, _, _ in tables)
+    edges = np.full((len(tables), width), np.inf)
+    tier_scores = np.zeros((len(tables), width + 1), dtype=np.int64)
+    n_edges = np.zeros(len(tables), dtype=np.int64)
+    left = np.zeros(len(tables), dtype=np.bool_)
+    for column, (_, metric_edges, side, metric_scores, _, _) in enumerate(tables):
+        edges[column, :len(metric_edges)] = metric_edges
+        tier_scores[column, :len(metric_scores)] = metric_scores
+        n_edges[column] = len(metric_edges)
+        left[column] = side == 'left'
+    return edges, n_edges, left, tier_scores
+
+
+def _score_kernel(current, historical, edges, n_edges, left, tier_scores, scores, tiers):
+    """
+    Clasificación fila a fila (compilada con numba, AOT o JIT, cuando está disponible).
+    
+    Equivale a np.searchsorted por columna más la regla de +5°C sobre el promedio.
+    """
+    for row in range(current.shape[0]):
+        for column in range(current.shape[1]):
+            value = current[row, column]
+            tier = 0
+            if value != value:  # NaN: igual que searchsorted (después de todos los bordes)
+                tier = n_edges[column]
+            else:
+                for k in range(n_edges[column]):
+                    edge = edges[column, k]
+                    if (edge < value) if left[column] else (edge <= value):
+                        tier += 1
+            tiers[row, column] = tier
+            scores[row, column] = tier_scores[column, tier]
+        
+        # Temperatura más de 5°C sobre el promedio histórico: score mínimo de 50
+        hist = historical[row, 0]
+        if hist != 0 and current[row, 0] - hist > 5 and scores[row, 0] < 50:
+            scores[row, 0] = 50
+
+
+# Kernel nativo: extensión AOT (scripts/build_risk_kernel.py) > JIT con numba > NumPy
+try:
+    from .risk_kernel import score_kernel as _compiled_kernel
+except ImportError:
+    _compiled_kernel = njit(cache=True)(_score_kernel) if njit is not None else None
 
-class RiskLevel(Enum):
-    """Niveles de riesgo climático"""
-    BAJO = "bajo"
-    MODERADO = "moderado"
-    ALTO = "alto"
-    CRITICO = "critico"
+
+# Niveles de riesgo climático (str planos: mismo formato que la respuesta JSON)
+RISK_BAJO = "bajo"
+RISK_MODERADO = "moderado"
+RISK_ALTO = "alto"
+RISK_CRITICO = "critico"
+
+RiskLevelName = Literal["bajo", "moderado", "alto", "critico"]
+
+
+class RiskLevel:
+    """Niveles de riesgo climático (constantes str, sin Enum)"""
+    BAJO = RISK_BAJO
+    MODERADO = RISK_MODERADO
+    ALTO = RISK_ALTO
+    CRITICO = RISK_CRITICO
 
 
 @dataclass
 class RiskAnalysis:
     """Resultado del análisis de riesgo"""
+    # __slots__ manual (dataclass(slots=True) requiere Python 3.10): sin __dict__ por instancia
+    __slots__ = (
+        'station_id', 'station_name', 'timestamp', 'risk_level', 'risk_score',
+        'factors', 'trends', 'recommendations', 'current_metrics', 'historical_avg'
+    )
+    
     station_id: int
     station_name: str
     timestamp: str
-    risk_level: RiskLevel
+    risk_level: RiskLevelName
     risk_score: float  # 0-100
     factors: List[Dict]  # Factores que contribuyen al riesgo
     trends: Dict  # Tendencias de las métricas
@@ -35,6 +160,49 @@ class RiskAnalysis:
     historical_avg: Dict
 
 
+# Campos de RiskAnalysis en la respuesta JSON (el resumen por estación omite timestamp)
+ANALYSIS_FIELDS = RiskAnalysis.__slots__
+STATION_SUMMARY_FIELDS = tuple(field for field in ANALYSIS_FIELDS if field != 'timestamp')
+_get_analysis_fields = attrgetter(*ANALYSIS_FIELDS)
+_get_summary_fields = attrgetter(*STATION_SUMMARY_FIELDS)
+
+
+def format_trends(trends: Dict) -> Dict:
+    """
+    Copia de las tendencias con 'change' redondeado a 2 decimales para la respuesta.
+    
+    Internamente los cambios se guardan sin redondear; solo se redondean aquí,
+    una vez, al serializar (sin modificar el análisis en caché).
+    """
+    return {
+        metric: {**trend, 'change': round(trend['change'], 2)}
+        for metric, trend in trends.items()
+    }
+
+
+def analysis_to_dict(analysis: RiskAnalysis, summary: bool = False) -> Dict:
+    """
+    Convierte un RiskAnalysis en diccionario serializable.
+    
+    Args:
+        analysis: Resultado del análisis
+        summary: Si es True, omite timestamp (formato de analyze_and_save_risk)
+        
+    Returns:
+        Diccionario con los campos en el orden de la respuesta
+    """
+    if summary:
+        result = dict(zip(STATION_SUMMARY_FIELDS, _get_summary_fields(analysis)))
+    else:
+        result = dict(zip(ANALYSIS_FIELDS, _get_analysis_fields(analysis)))
+    result['trends'] = format_trends(analysis.trends)
+    return result
+
+
+# Último análisis por (estación, horas): marca de get_latest_update sobre la ventana analizada
+_LAST_ANALYSIS: Dict[Tuple[int, int], Tuple[Tuple[int, int, int], RiskAnalysis]] = {}
+
+
 class RiskAnalyzer:
     """Analizador de riesgo basado en datos históricos"""
     
@@ -69,13 +237,51 @@ class RiskAnalyzer:
         }
     }
     
+    # THRESHOLDS convertido a tablas ordenadas para la clasificación vectorizada
+    _SCORE_TABLES = _build_score_tables(THRESHOLDS)
+    _PACKED_TABLES = _pack_score_tables(_SCORE_TABLES)
+    
+    # Niveles de riesgo por score general: [0,30) bajo, [30,60) moderado, [60,80) alto, >=80 crítico
+    _LEVEL_EDGES = np.array([30, 60, 80])
+    _LEVELS = (RISK_BAJO, RISK_MODERADO, RISK_ALTO, RISK_CRITICO)
+    
+    # Textos de recomendaciones, precalculados por nivel / métrica / tendencia
+    _LEVEL_RECOMMENDATIONS = {
+        RISK_CRITICO: (
+            " ALERTA CRÍTICA: Condiciones climáticas peligrosas",
+            "Evitar actividades al aire libre",
+            "Mantenerse informado sobre alertas oficiales",
+        ),
+        RISK_ALTO: (
+            " Precaución: Condiciones climáticas adversas",
+            "Limitar actividades al aire libre",
+        ),
+        RISK_MODERADO: (" Atención: Monitorear condiciones climáticas",),
+        RISK_BAJO: (" Condiciones normales",),
+    }
+    _HIGH_SEVERITIES = frozenset(('critical', 'high'))
+    _METRIC_RECOMMENDATIONS = {
+        'precipitation': (" Riesgo de inundaciones - evitar zonas bajas",),
+        'wind': (" Vientos fuertes - asegurar objetos sueltos",),
+        'temperature': (" Temperatura extrema - hidratarse adecuadamente",),
+        'pressure': (" Presión baja - posible tormenta cercana",),
+    }
+    _TREND_RECOMMENDATIONS = (
+        ('precipitation_total', " Precipitación en aumento - prepararse para lluvia"),
+        ('wind_speed', " Vientos en aumento - tomar precauciones"),
+    )
+    
     def __init__(self):
         """Inicializa el analizador"""
         from core.database.raindrop_db import (
             get_latest_data_by_station,
+            get_latest_data_by_stations,
+            get_latest_update,
             get_data_by_date_range
         )
         self.get_latest = get_latest_data_by_station
+        self.get_latest_update = get_latest_update
+        self.get_latest_many = get_latest_data_by_stations
         self.get_range = get_data_by_date_range
     
     def analyze_station_risk(
@@ -93,105 +299,158 @@ class RiskAnalyzer:
         Returns:
             RiskAnalysis con el resultado del análisis
         """
+        key = (station_id, hours_to_compare)
         try:
-            # Obtener datos históricos
-            historical_data = self.get_latest(station_id, limit=hours_to_compare)
+            # Consulta mínima: solo la marca de los registros de la ventana
+            latest_update = self.get_latest_update(station_id, limit=hours_to_compare)
             
-            if not historical_data or len(historical_data) == 0:
-                logger.warning(f"No hay datos históricos para estación {station_id}")
-                return None
-            
-            # El primer registro es el más reciente
-            current = historical_data[0]
-            
-            # Calcular promedios históricos (excluyendo el actual)
-            historical_avg = self._calculate_averages(historical_data[1:])
-            
-            # Analizar cada métrica
-            factors = []
-            risk_scores = []
-            
-            # 1. Temperatura
-            temp_risk = self._analyze_temperature(
-                current.get('temperature'),
-                historical_avg.get('temperature')
-            )
-            if temp_risk:
-                factors.append(temp_risk)
-                risk_scores.append(temp_risk['score'])
-            
-            # 2. Humedad
-            humidity_risk = self._analyze_humidity(
-                current.get('humidity'),
-                historical_avg.get('humidity')
-            )
-            if humidity_risk:
-                factors.append(humidity_risk)
-                risk_scores.append(humidity_risk['score'])
-            
-            # 3. Precipitación
-            precip_risk = self._analyze_precipitation(
-                current.get('precipitation_total'),
-                historical_avg.get('precipitation_total')
-            )
-            if precip_risk:
-                factors.append(precip_risk)
-                risk_scores.append(precip_risk['score'])
-            
-            # 4. Viento
-            wind_risk = self._analyze_wind(
-                current.get('wind_speed'),
-                historical_avg.get('wind_speed')
-            )
-            if wind_risk:
-                factors.append(wind_risk)
-                risk_scores.append(wind_risk['score'])
-            
-            # 5. Presión
-            pressure_risk = self._analyze_pressure(
-                current.get('pressure'),
-                historical_avg.get('pressure')
-            )
-            if pressure_risk:
-                factors.append(pressure_risk)
-                risk_scores.append(pressure_risk['score'])
-            
-            # Calcular score general y nivel de riesgo
-            overall_score = max(risk_scores) if risk_scores else 0
-            risk_level = self._calculate_risk_level(overall_score)
-            
-            # Calcular tendencias
-            trends = self._calculate_trends(historical_data)
-            
-            # Generar recomendaciones
-            recommendations = self._generate_recommendations(
-                risk_level, 
-                factors, 
-                trends
-            )
-            
-            return RiskAnalysis(
-                station_id=station_id,
-                station_name=current.get('station_name', f'Estación {station_id}'),
-                timestamp=current.get('timestamp'),
-                risk_level=risk_level,
-                risk_score=round(overall_score, 2),
-                factors=factors,
-                trends=trends,
-                recommendations=recommendations,
-                current_metrics={
-                    'temperature': current.get('temperature'),
-                    'humidity': current.get('humidity'),
-                    'precipitation_total': current.get('precipitation_total'),
-                    'wind_speed': current.get('wind_speed'),
-                    'pressure': current.get('pressure')
-                },
-                historical_avg=historical_avg
-            )
+            # Ventana sin cambios desde el último análisis: reutilizarlo
+            cached = _LAST_ANALYSIS.get(key)
+            if latest_update is not None and cached is not None and cached[0] == latest_update:
+                return cached[1]
             
+            # Obtener datos históricos
+            historical_data = self.get_latest(station_id, limit=hours_to_compare, as_dict=False)
         except Exception as e:
             logger.error(f"Error analizando riesgo para estación {station_id}: {e}")
             return None
+        
+        analysis = self._analyze_from_rows(station_id, historical_data)
+        if analysis is not None and latest_update is not None:
+            _LAST_ANALYSIS[key] = (latest_update, analysis)
+        
+        return analysis
+    
+    def _analyze_from_rows(
+        self, 
+        station_id: int, 
+        historical_data: List[Dict]
+    ) -> Optional[RiskAnalysis]:
+        """
+        Analiza el riesgo de una estación a partir de registros ya cargados.
+        
+        Args:
+            station_id: ID de la estación
+            historical_data: Registros ordenados del más reciente al más antiguo
+            
+        Returns:
+            RiskAnalysis con el resultado del análisis
+        """
+        results = self._analyze_batch({station_id: historical_data})
+        return results[0] if results else None
+    
+    def _analyze_batch(self, rows_by_station: Dict[int, List[Dict]]) -> List[RiskAnalysis]:
+        """
+        Analiza varias estaciones: prepara cada una y clasifica todas las métricas
+        de todas las estaciones en una sola pasada vectorizada.
+        
+        Args:
+            rows_by_station: station_id -> registros ordenados del más reciente al más antiguo
+            
+        Returns:
+            Lista de RiskAnalysis (en el orden de entrada, omitiendo estaciones sin datos)
+        """
+        prepared = []
+        for station_id, historical_data in rows_by_station.items():
+            if not historical_data or len(historical_data) == 0:
+                logger.warning(f"No hay datos históricos para estación {station_id}")
+                continue
+            try:
+                soa = self._to_soa(historical_data)
+                historical_avg = self._calculate_averages(
+                    {metric: column[1:] for metric, column in soa.items()}
+                )
+                prepared.append((station_id, historical_data[0], soa, historical_avg))
+            except Exception as e:
+                logger.error(f"Error analizando riesgo para estación {station_id}: {e}")
+        
+        if not prepared:
+            return []
+        
+        # Matrices (estaciones x métricas) de valores actuales y promedios históricos
+        current = np.array([[soa[metric][0] for metric in METRICS] for _, _, soa, _ in prepared])
+        historical = np.array(
+            [[avg.get(metric, np.nan) for metric in METRICS] for _, _, _, avg in prepared],
+            dtype=np.float64
+        )
+        scores, tiers = self._score_metrics(current, historical)
+        
+        # Métricas sin valor actual no aportan factor ni score
+        scores[np.isnan(current)] = 0
+        
+        # Score general y nivel de riesgo de todas las estaciones a la vez
+        overall = scores.max(axis=1)
+        levels = np.digitize(overall, self._LEVEL_EDGES)
+        
+        # Posiciones (estación, métrica) con factor; filas ordenadas -> cortes por estación
+        factor_rows, factor_cols = np.nonzero(scores)
+        bounds = np.searchsorted(factor_rows, np.arange(len(prepared) + 1)).tolist()
+        
+        results = []
+        for row, (station_id, latest, soa, historical_avg) in enumerate(prepared):
+            try:
+                results.append(self._build_analysis(
+                    station_id, latest, soa, historical_avg,
+                    factor_cols[bounds[row]:bounds[row + 1]].tolist(),
+                    scores[row].tolist(),
+                    tiers[row].tolist(),
+                    int(overall[row]),
+                    self._LEVELS[levels[row]]
+                ))
+            except Exception as e:
+                logger.error(f"Error analizando riesgo para estación {station_id}: {e}")
+        
+        return results
+    
+    def _build_analysis(
+        self,
+        station_id: int,
+        latest: Dict,
+        soa: Dict[str, np.ndarray],
+        historical_avg: Dict,
+        factor_columns: List[int],
+        scores: List[int],
+        tiers: List[int],
+        overall_score: int,
+        risk_level: RiskLevelName
+    ) -> RiskAnalysis:
+        """Arma el RiskAnalysis de una estación a partir de sus scores y nivel ya calculados"""
+        current_values = self._current_values(soa)
+        
+        # Factores solo para las métricas con score > 0 (ya filtradas por np.nonzero)
+        factors = [
+            self._build_factor(
+                column,
+                current_values[METRICS[column]],
+                historical_avg.get(METRICS[column]),
+                scores[column],
+                tiers[column]
+            )
+            for column in factor_columns
+        ]
+        
+        # Calcular tendencias
+        trends = self._calculate_trends(soa)
+        
+        # Generar recomendaciones
+        recommendations = self._generate_recommendations(
+            risk_level, 
+            factors, 
+            trends
+        )
+        
+        return RiskAnalysis(
+            station_id=station_id,
+            station_name=latest['station_name'] or f'Estación {station_id}',
+            timestamp=latest['timestamp'],
+            risk_level=risk_level,
+            risk_score=overall_score,
+            factors=factors,
+            trends=trends,
+            recommendations=recommendations,
+            current_metrics=current_values,
+            historical_avg=historical_avg
+        )
     
     def analyze_all_stations(
         self, 
@@ -206,311 +465,230 @@ class RiskAnalyzer:
         Returns:
             Lista de análisis de riesgo por estación
         """
-        results = []
+        # IDs de las estaciones con datos (caché de 5 minutos)
+        try:
+            station_ids = get_active_station_ids().tolist()
+        except Exception as e:
+            logger.error(f"Error obteniendo estaciones activas: {e}")
+            return []
         
-        # IDs de las +250 estaciones en Panamá
-        station_ids = range(1, 16)
+        # Una sola consulta para todas las estaciones (últimos N registros de cada una)
+        try:
+            rows_by_station = self.get_latest_many(
+                station_ids, limit=hours_to_compare, as_dict=False
+            )
+        except Exception as e:
+            logger.error(f"Error obteniendo datos de estaciones: {e}")
+            return []
         
-        for station_id in station_ids:
-            analysis = self.analyze_station_risk(station_id, hours_to_compare)
-            if analysis:
-                results.append(analysis)
+        results = self._analyze_batch(
+            {station_id: rows_by_station.get(station_id, []) for station_id in station_ids}
+        )
         
         # Ordenar por score de riesgo (mayor a menor)
         results.sort(key=lambda x: x.risk_score, reverse=True)
         
         return results
     
-    def _calculate_averages(self, data: List[Dict]) -> Dict:
+
+    def _to_soa(self, data: List[Dict]) -> Dict[str, np.ndarray]:
+        """Registros (dicts o sqlite3.Row) -> una columna float64 contigua por métrica, NaN si falta"""
+        matrix = np.array(
+            [[row[metric] for metric in METRICS] for row in data],
+            dtype=np.float64
+        ).reshape(len(data), len(METRICS))
+        # Transponer y copiar: cada métrica queda contigua en memoria
+        return dict(zip(METRICS, matrix.T.copy()))
+    
+    def _current_values(self, soa: Dict[str, np.ndarray]) -> Dict[str, Optional[float]]:
+        """Valores del registro más reciente (None si falta el dato)"""
+        current = {}
+        for metric, column in soa.items():
+            value = float(column[0])
+            current[metric] = None if value != value else value
+        return current
+    
+    def _calculate_averages(self, soa: Dict[str, np.ndarray]) -> Dict:
         """Calcula promedios de métricas históricas"""
-        if not data:
-            return {}
-        
-        metrics = ['temperature', 'humidity', 'precipitation_total', 
-                   'wind_speed', 'pressure']
         averages = {}
         
-        for metric in metrics:
-            values = [d.get(metric) for d in data if d.get(metric) is not None]
-            if values:
-                averages[metric] = sum(values) / len(values)
+        for metric, column in soa.items():
+            valid = column[~np.isnan(column)]
+            if valid.size:
+                averages[metric] = float(valid.mean())
         
         return averages
     
-    def _analyze_temperature(
-        self, 
-        current: Optional[float], 
-        historical_avg: Optional[float]
-    ) -> Optional[Dict]:
-        """Analiza riesgo por temperatura"""
-        if current is None:
-            return None
+    def _score_metrics(
+        self,
+        current: np.ndarray,
+        historical: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Clasifica todas las métricas de todas las estaciones sin ramas por valor.
         
-        score = 0
-        severity = "normal"
-        message = f"Temperatura: {current}°C"
-        
-        # Verificar umbrales absolutos
-        if current >= self.THRESHOLDS['temperature']['critical']:
-            score = 90
-            severity = "critical"
-            message = f"Temperatura crítica: {current}°C"
-        elif current >= self.THRESHOLDS['temperature']['high']:
-            score = 70
-            severity = "high"
-            message = f"Temperatura alta: {current}°C"
-        elif current >= self.THRESHOLDS['temperature']['normal_max']:
-            score = 40
-            severity = "moderate"
-            message = f"Temperatura sobre el promedio: {current}°C"
-        
-        # Comparar con histórico
-        if historical_avg:
-            diff = current - historical_avg
-            if diff > 5:
-                score = max(score, 50)
-                message += f" (+{diff:.1f}°C vs promedio)"
+        Args:
+            current: Matriz (estaciones x METRICS) de valores actuales, NaN si falta
+            historical: Matriz (estaciones x METRICS) de promedios históricos, NaN si falta
+            
+        Returns:
+            Tuple (scores, tramos) con matrices int de la misma forma
+        """
+        tiers = np.empty(current.shape, dtype=np.int64)
+        scores = np.empty(current.shape, dtype=np.int64)
+        
+        if _compiled_kernel is not None:
+            _compiled_kernel(
+                np.ascontiguousarray(current, dtype=np.float64),
+                np.ascontiguousarray(historical, dtype=np.float64),
+                *self._PACKED_TABLES,
+                scores,
+                tiers
+            )
+            return scores, tiers
         
-        return {
-            'metric': 'temperature',
-            'score': score,
-            'severity': severity,
-            'message': message,
-            'current': current,
-            'historical_avg': historical_avg
-        }
-    
-    def _analyze_humidity(
-        self, 
-        current: Optional[float], 
-        historical_avg: Optional[float]
-    ) -> Optional[Dict]:
-        """Analiza riesgo por humedad"""
-        if current is None:
-            return None
+        for column, (_, edges, side, tier_scores, _, _) in enumerate(self._SCORE_TABLES):
+            tiers[:, column] = np.searchsorted(edges, current[:, column], side=side)
+            scores[:, column] = tier_scores[tiers[:, column]]
         
-        score = 0
-        severity = "normal"
-        message = f"Humedad: {current}%"
-        
-        if current >= self.THRESHOLDS['humidity']['critical']:
-            score = 80
-            severity = "critical"
-            message = f"Humedad crítica: {current}%"
-        elif current >= self.THRESHOLDS['humidity']['high']:
-            score = 60
-            severity = "high"
-            message = f"Humedad muy alta: {current}%"
-        elif current < self.THRESHOLDS['humidity']['normal_min']:
-            score = 30
-            severity = "moderate"
-            message = f"Humedad baja: {current}%"
+        # Temperatura más de 5°C sobre el promedio histórico: score mínimo de 50
+        temp_diff = current[:, 0] - historical[:, 0]
+        hotter = (historical[:, 0] != 0) & (temp_diff > 5)
+        scores[:, 0] = np.where(hotter, np.maximum(scores[:, 0], 50), scores[:, 0])
         
-        return {
-            'metric': 'humidity',
-            'score': score,
-            'severity': severity,
-            'message': message,
-            'current': current,
-            'historical_avg': historical_avg
-        }
+        return scores, tiers
     
-    def _analyze_precipitation(
-        self, 
-        current: Optional[float], 
-        historical_avg: Optional[float]
-    ) -> Optional[Dict]:
-        """Analiza riesgo por precipitación"""
-        if current is None:
-            return None
-        
-        score = 0
-        severity = "normal"
-        message = f"Precipitación: {current}mm"
-        
-        if current >= self.THRESHOLDS['precipitation_total']['critical']:
-            score = 95
-            severity = "critical"
-            message = f"Lluvia crítica: {current}mm/h"
-        elif current >= self.THRESHOLDS['precipitation_total']['high']:
-            score = 75
-            severity = "high"
-            message = f"Lluvia intensa: {current}mm/h"
-        elif current >= self.THRESHOLDS['precipitation_total']['moderate']:
-            score = 50
-            severity = "moderate"
-            message = f"Lluvia moderada: {current}mm/h"
-        elif current > 0:
-            score = 20
-            severity = "low"
-            message = f"Lluvia ligera: {current}mm/h"
+    def _build_factor(
+        self,
+        column: int,
+        current: float,
+        historical_avg: Optional[float],
+        score: int,
+        tier: int
+    ) -> Dict:
+        """
+        Arma el factor de riesgo de una métrica a partir de su tramo de umbrales.
         
-        return {
-            'metric': 'precipitation',
-            'score': score,
-            'severity': severity,
-            'message': message,
-            'current': current,
-            'historical_avg': historical_avg
-        }
-    
-    def _analyze_wind(
-        self, 
-        current: Optional[float], 
-        historical_avg: Optional[float]
-    ) -> Optional[Dict]:
-        """Analiza riesgo por viento"""
-        if current is None:
-            return None
+        Solo se llama para métricas con dato y score > 0: las demás no aportan
+        factor y su mensaje nunca se formatea.
+        """
+        name, _, _, _, severities, messages = self._SCORE_TABLES[column]
+        message = messages[tier].format(current)
         
-        score = 0
-        severity = "normal"
-        message = f"Viento: {current} km/h"
-        
-        if current >= self.THRESHOLDS['wind_speed']['critical']:
-            score = 85
-            severity = "critical"
-            message = f"Vientos peligrosos: {current} km/h"
-        elif current >= self.THRESHOLDS['wind_speed']['high']:
-            score = 65
-            severity = "high"
-            message = f"Vientos fuertes: {current} km/h"
-        elif current >= self.THRESHOLDS['wind_speed']['moderate']:
-            score = 40
-            severity = "moderate"
-            message = f"Vientos moderados: {current} km/h"
+        # Comparar temperatura con histórico
+        if name == 'temperature' and historical_avg:
+            diff = current - historical_avg
+            if diff > 5:
+                message += f" (+{diff:.1f}°C vs promedio)"
         
         return {
-            'metric': 'wind',
+            'metric': name,
             'score': score,
-            'severity': severity,
+            'severity': severities[tier],
             'message': message,
             'current': current,
             'historical_avg': historical_avg
         }
     
-    def _analyze_pressure(
-        self, 
-        current: Optional[float], 
-        historical_avg: Optional[float]
-    ) -> Optional[Dict]:
-        """Analiza riesgo por presión atmosférica"""
-        if current is None:
-            return None
+    def _calculate_trends(self, soa: Dict[str, np.ndarray]) -> Dict:
+        """Calcula tendencias de las últimas horas"""
+        if len(soa[METRICS[0]]) < 3:
+            return {}
+        
+        # Últimos 3 registros de todas las métricas: matriz (métricas x 3)
+        recent = np.stack([column[:3] for column in soa.values()])
+        valid = ~np.isnan(recent)
+        counts = valid.sum(axis=1)
         
-        score = 0
-        severity = "normal"
-        message = f"Presión: {current} hPa"
-        
-        if current <= self.THRESHOLDS['pressure']['low_critical']:
-            score = 80
-            severity = "critical"
-            message = f"Presión muy baja: {current} hPa (tormenta posible)"
-        elif current <= self.THRESHOLDS['pressure']['low_warning']:
-            score = 55
-            severity = "high"
-            message = f"Presión baja: {current} hPa"
-        elif current < self.THRESHOLDS['pressure']['normal_min']:
-            score = 30
-            severity = "moderate"
-            message = f"Presión bajo el promedio: {current} hPa"
+        # Tendencia simple: primer valor válido (más reciente) menos el último válido
+        rows = np.arange(len(recent))
+        first = recent[rows, valid.argmax(axis=1)]
+        last = recent[rows, recent.shape[1] - 1 - valid[:, ::-1].argmax(axis=1)]
+        changes = (first - last).tolist()
         
         return {
-            'metric': 'pressure',
-            'score': score,
-            'severity': severity,
-            'message': message,
-            'current': current,
-            'historical_avg': historical_avg
+            metric: {
+                # Umbral de cambio significativo: 0.5
+                'trend': "estable" if abs(change) <= 0.5 else ("subiendo" if change > 0 else "bajando"),
+                'change': change,
+                'recent_values': values[mask].tolist()
+            }
+            for metric, values, mask, count, change in zip(soa, recent, valid, counts, changes)
+            if count >= 2
         }
     
-    def _calculate_trends(self, historical_data: List[Dict]) -> Dict:
-        """Calcula tendencias de las últimas horas"""
-        if len(historical_data) < 3:
-            return {}
-        
-        trends = {}
-        metrics = ['temperature', 'humidity', 'precipitation_total', 
-                   'wind_speed', 'pressure']
-        
-        for metric in metrics:
-            # Tomar últimos 3 registros
-            recent = [d.get(metric) for d in historical_data[:3] 
-                     if d.get(metric) is not None]
-            
-            if len(recent) >= 2:
-                # Calcular tendencia (simple: comparar primero vs último)
-                change = recent[0] - recent[-1]
-                trend = "estable"
-                
-                if abs(change) > 0.5:  # Umbral de cambio significativo
-                    trend = "subiendo" if change > 0 else "bajando"
-                
-                trends[metric] = {
-                    'trend': trend,
-                    'change': round(change, 2),
-                    'recent_values': recent
-                }
-        
-        return trends
-    
-    def _calculate_risk_level(self, score: float) -> RiskLevel:
+    def _calculate_risk_level(self, score: float) -> RiskLevelName:
         """Calcula el nivel de riesgo basado en el score"""
-        if score >= 80:
-            return RiskLevel.CRITICO
-        elif score >= 60:
-            return RiskLevel.ALTO
-        elif score >= 30:
-            return RiskLevel.MODERADO
-        else:
-            return RiskLevel.BAJO
+        return self._LEVELS[np.digitize(score, self._LEVEL_EDGES)]
     
     def _generate_recommendations(
         self, 
-        risk_level: RiskLevel, 
+        risk_level: RiskLevelName, 
         factors: List[Dict],
         trends: Dict
     ) -> List[str]:
         """Genera recomendaciones basadas en el análisis"""
-        recommendations = []
-        
         # Recomendaciones por nivel de riesgo general
-        if risk_level == RiskLevel.CRITICO:
-            recommendations.append(" ALERTA CRÍTICA: Condiciones climáticas peligrosas")
-            recommendations.append("Evitar actividades al aire libre")
-            recommendations.append("Mantenerse informado sobre alertas oficiales")
-        elif risk_level == RiskLevel.ALTO:
-            recommendations.append(" Precaución: Condiciones climáticas adversas")
-            recommendations.append("Limitar actividades al aire libre")
-        elif risk_level == RiskLevel.MODERADO:
-            recommendations.append(" Atención: Monitorear condiciones climáticas")
-        else:
-            recommendations.append(" Condiciones normales")
-        
-        # Recomendaciones específicas por factor
+        recommendations = list(self._LEVEL_RECOMMENDATIONS[risk_level])
+        
+        # Recomendaciones específicas por factor (cada métrica aparece una sola vez)
         for factor in factors:
-            if factor['severity'] in ['critical', 'high']:
-                metric = factor['metric']
-                
-                if metric == 'precipitation':
-                    recommendations.append(" Riesgo de inundaciones - evitar zonas bajas")
-                elif metric == 'wind':
-                    recommendations.append(" Vientos fuertes - asegurar objetos sueltos")
-                elif metric == 'temperature':
-                    recommendations.append(" Temperatura extrema - hidratarse adecuadamente")
-                elif metric == 'pressure':
-                    recommendations.append(" Presión baja - posible tormenta cercana")
+            if factor['severity'] in self._HIGH_SEVERITIES:
+                recommendations.extend(self._METRIC_RECOMMENDATIONS.get(factor['metric'], ()))
         
         # Recomendaciones por tendencias
-        if trends.get('precipitation_total', {}).get('trend') == 'subiendo':
-            recommendations.append(" Precipitación en aumento - prepararse para lluvia")
-        
-        if trends.get('wind_speed', {}).get('trend') == 'subiendo':
-            recommendations.append(" Vientos en aumento - tomar precauciones")
+        for metric, message in self._TREND_RECOMMENDATIONS:
+            if trends.get(metric, {}).get('trend') == 'subiendo':
+                recommendations.append(message)
         
         return recommendations
 
 
+# Vigencia de la lista de estaciones activas (segundos)
+ACTIVE_STATIONS_CACHE_SECONDS = 300
+_active_station_ids_expiry = 0.0
+
+
+@lru_cache(maxsize=1)
+def _load_active_station_ids() -> np.ndarray:
+    """Consulta los IDs de estaciones con datos como array int32 de solo lectura"""
+    from core.database.raindrop_db import get_station_ids_with_data
+    
+    station_ids = np.array(get_station_ids_with_data(), dtype=np.int32)
+    station_ids.setflags(write=False)
+    return station_ids
+
+
+def get_active_station_ids() -> np.ndarray:
+    """
+    Obtiene los IDs de las estaciones con datos, consultando la BD como máximo
+    una vez cada ACTIVE_STATIONS_CACHE_SECONDS.
+    
+    Returns:
+        Array np.int32 ordenado (solo lectura) con los IDs de estación
+    """
+    global _active_station_ids_expiry
+    
+    now = time.monotonic()
+    if now >= _active_station_ids_expiry:
+        _load_active_station_ids.cache_clear()
+        _active_station_ids_expiry = now + ACTIVE_STATIONS_CACHE_SECONDS
+    
+    return _load_active_station_ids()
+
+
+# Instancia compartida (sin estado mutable: solo referencias a funciones de BD y tablas)
+_risk_analyzer = None
+
+
+def get_risk_analyzer() -> RiskAnalyzer:
+    """Obtiene la instancia singleton del analizador de riesgo."""
+    global _risk_analyzer
+    if _risk_analyzer is None:
+        _risk_analyzer = RiskAnalyzer()
+    return _risk_analyzer
+
+
 def analyze_and_save_risk(station_id: Optional[int] = None) -> Dict:
     """
     Analiza riesgo y guarda en base de datos.
@@ -521,7 +699,7 @@ def analyze_and_save_risk(station_id: Optional[int] = None) -> Dict:
     Returns:
         Diccionario con resultados del análisis
     """
-    analyzer = RiskAnalyzer()
+    analyzer = get_risk_analyzer()
     
     if station_id:
         analysis = analyzer.analyze_station_risk(station_id)
@@ -529,36 +707,19 @@ def analyze_and_save_risk(station_id: Optional[int] = None) -> Dict:
     else:
         results = analyzer.analyze_all_stations()
     
-    # Preparar respuesta
+    # Contar por nivel de riesgo
+    risk_summary = dict.fromkeys((RISK_CRITICO, RISK_ALTO, RISK_MODERADO, RISK_BAJO), 0)
+    for analysis in results:
+        risk_summary[analysis.risk_level] += 1
+    
+    # Preparar respuesta (lista de estaciones creada de una vez, sin append por estación)
     response = {
         'timestamp': datetime.now(timezone.utc).isoformat(),
         'total_stations': len(results),
-        'risk_summary': {
-            'critico': 0,
-            'alto': 0,
-            'moderado': 0,
-            'bajo': 0
-        },
-        'stations': []
+        'risk_summary': risk_summary,
+        'stations': [analysis_to_dict(analysis, summary=True) for analysis in results]
     }
     
-    for analysis in results:
-        # Contar por nivel de riesgo
-        response['risk_summary'][analysis.risk_level.value] += 1
-        
-        # Agregar análisis de estación
-        response['stations'].append({
-            'station_id': analysis.station_id,
-            'station_name': analysis.station_name,
-            'risk_level': analysis.risk_level.value,
-            'risk_score': analysis.risk_score,
-            'factors': analysis.factors,
-            'trends': analysis.trends,
-            'recommendations': analysis.recommendations,
-            'current_metrics': analysis.current_metrics,
-            'historical_avg': analysis.historical_avg
-        })
-    
     return response
 
 
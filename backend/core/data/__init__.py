@@ -0,0 +1,3 @@
+"""
+Datos estáticos de rAIndrop (estaciones meteorológicas)
+"""
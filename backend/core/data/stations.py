@@ -0,0 +1,314 @@
+"""
+Arreglos NumPy derivados de STATIONS para consultas vectorizadas
+
+Se construyen una sola vez al importar el módulo (layout SoA: un arreglo
+contiguo por campo, alineados por posición con STATIONS). Las versiones
+float32 se usan en máscaras geográficas (precisión de ~1 m es suficiente);
+las float64 se mantienen para distancias finales.
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from enum import IntEnum
+
+import numpy as np
+import pandas as pd
+
+from .stations_data import STATIONS
+
+_n = len(STATIONS)
+
+_ids = np.fromiter((s["id"] for s in STATIONS), dtype=np.int32, count=_n)
+_names = np.array([s["name"] for s in STATIONS], dtype=object)
+_regions = np.array([s["region"] for s in STATIONS], dtype=object)
+_numeros = np.array([s["numero"] for s in STATIONS], dtype=object)
+_tipos = np.array([s["tipo"] for s in STATIONS], dtype=object)
+
+# Coordenadas en float64 (distancias finales)
+_lats = np.fromiter((s["lat"] for s in STATIONS), dtype=np.float64, count=_n)
+_lons = np.fromiter((s["lon"] for s in STATIONS), dtype=np.float64, count=_n)
+_elev = np.fromiter((s["elevation"] for s in STATIONS), dtype=np.float64, count=_n)
+
+# Coordenadas en float32 (máscaras y filtros: mitad de bytes por consulta)
+_lats32 = _lats.astype(np.float32)
+_lons32 = _lons.astype(np.float32)
+_elev32 = _elev.astype(np.float32)
+
+# Vista tabular (region/tipo como categorías) y arreglo estructurado numérico
+STATIONS_DF = pd.DataFrame({
+    "id": _ids,
+    "name": _names,
+    "region": pd.Categorical(_regions),
+    "lat": _lats,
+    "lon": _lons,
+    "elevation": _elev,
+    "numero": _numeros,
+    "tipo": pd.Categorical(_tipos),
+})
+
+STATIONS_ARRAY = np.empty(
+    _n, dtype=[("id", "i4"), ("lat", "f4"), ("lon", "f4"), ("elevation", "f4")]
+)
+STATIONS_ARRAY["id"] = _ids
+STATIONS_ARRAY["lat"] = _lats32
+STATIONS_ARRAY["lon"] = _lons32
+STATIONS_ARRAY["elevation"] = _elev32
+
+
+def _group_indices(values) -> dict:
+    """Agrupa posiciones por valor: {valor: arreglo int32 de índices}."""
+    groups = defaultdict(list)
+    for i, value in enumerate(values):
+        groups[value].append(i)
+    return {k: np.asarray(v, dtype=np.int32) for k, v in groups.items()}
+
+
+# Índices precalculados por región / tipo (posiciones en STATIONS y en los arreglos SoA)
+STATIONS_BY_REGION = _group_indices(_regions)
+STATIONS_BY_TIPO = _group_indices(_tipos)
+_EMPTY_INDEX = np.empty(0, dtype=np.int32)
+
+
+def stations_in_region(region: str) -> np.ndarray:
+    """Índices (int32) de las estaciones de una región; vacío si no existe."""
+    return STATIONS_BY_REGION.get(region, _EMPTY_INDEX)
+
+
+def bbox_mask(lat_min: float, lat_max: float, lon_min: float, lon_max: float) -> np.ndarray:
+    """
+    Máscara booleana de estaciones dentro de un rectángulo lat/lon.
+
+    Returns:
+        Arreglo bool de largo len(STATIONS), alineado con STATIONS
+    """
+    return (
+        (_lats32 >= np.float32(lat_min)) & (_lats32 <= np.float32(lat_max))
+        & (_lons32 >= np.float32(lon_min)) & (_lons32 <= np.float32(lon_max))
+    )
+
+
+# Índice de grilla uniforme (~11 km por celda en Panamá) para consultas por rectángulo
+GRID_CELL_DEG = 0.1
+
+
+def _cell(lat: float, lon: float) -> tuple:
+    return (math.floor(lat / GRID_CELL_DEG), math.floor(lon / GRID_CELL_DEG))
+
+
+STATION_GRID = _group_indices(_cell(lat, lon) for lat, lon in zip(_lats, _lons))
+
+
+def stations_in_bbox(lat_min: float, lat_max: float, lon_min: float, lon_max: float) -> np.ndarray:
+    """
+    Índices de estaciones dentro de un rectángulo, recorriendo solo las celdas que lo cubren.
+
+    Returns:
+        Arreglo int32 ordenado de posiciones en STATIONS
+    """
+    row_min, col_min = _cell(lat_min, lon_min)
+    row_max, col_max = _cell(lat_max, lon_max)
+    candidates = [
+        STATION_GRID[(row, col)]
+        for row in range(row_min, row_max + 1)
+        for col in range(col_min, col_max + 1)
+        if (row, col) in STATION_GRID
+    ]
+    if not candidates:
+        return _EMPTY_INDEX
+    idx = np.sort(np.concatenate(candidates))
+    inside = (
+        (_lats32[idx] >= np.float32(lat_min)) & (_lats32[idx] <= np.float32(lat_max))
+        & (_lons32[idx] >= np.float32(lon_min)) & (_lons32[idx] <= np.float32(lon_max))
+    )
+    return idx[inside]
+
+
+def _hilbert_key(x: int, y: int, side: int) -> int:
+    """Distancia a lo largo de la curva de Hilbert de la celda (x, y) en una grilla side x side."""
+    d = 0
+    s = side // 2
+    while s > 0:
+        rx = 1 if x & s else 0
+        ry = 1 if y & s else 0
+        d += s * s * ((3 * rx) ^ ry)
+        if ry == 0:
+            if rx == 1:
+                x = side - 1 - x
+                y = side - 1 - y
+            x, y = y, x
+        s //= 2
+    return d
+
+
+# Orden de Hilbert de las estaciones (vecinas en el mapa quedan contiguas en memoria).
+# STATIONS y los arreglos SoA conservan el orden original: los índices devueltos por
+# este módulo siguen siendo posiciones en STATIONS; solo los recorridos lineales
+# repetidos usan las copias permutadas.
+HILBERT_BITS = 10
+_side = 1 << HILBERT_BITS
+_hx = np.clip(((_lats + 90.0) / 180.0 * _side).astype(np.int64), 0, _side - 1)
+_hy = np.clip(((_lons + 180.0) / 360.0 * _side).astype(np.int64), 0, _side - 1)
+HILBERT_ORDER = np.argsort(
+    np.fromiter((_hilbert_key(int(x), int(y), _side) for x, y in zip(_hx, _hy)), dtype=np.int64, count=_n),
+    kind="stable",
+).astype(np.int32)
+del _side, _hx, _hy
+
+ROW_BY_ID = {int(station_id): row for row, station_id in enumerate(_ids)}
+
+
+class _StationEnum(IntEnum):
+    """Estación como miembro de enum; el valor es su posición en STATIONS / arreglos SoA."""
+
+    @property
+    def id(self) -> int:
+        return int(_ids[self])
+
+    @property
+    def lat(self) -> float:
+        return float(_lats[self])
+
+    @property
+    def lon(self) -> float:
+        return float(_lons[self])
+
+    @property
+    def elevation(self) -> float:
+        return float(_elev[self])
+
+    @property
+    def info(self):
+        """Mapping completo de la estación en STATIONS."""
+        return STATIONS[self]
+
+
+def _member_names() -> list:
+    """Nombres de estación como identificadores; los repetidos llevan el id como sufijo."""
+    names = [re.sub(r"\W+", "_", str(name).upper()).strip("_") for name in _names]
+    repeated = {name for name, count in Counter(names).items() if count > 1}
+    return [f"{name}_{station_id}" if name in repeated else name for name, station_id in zip(names, _ids)]
+
+
+# Ej: Station.CHANGUINOLA_SUR.lat, Station["SANTA_FE_183"].id, STATIONS[Station.MIRAMAR]
+Station = _StationEnum("Station", [(name, row) for row, name in enumerate(_member_names())])
+
+_lats32_h = _lats32[HILBERT_ORDER]
+_lons32_h = _lons32[HILBERT_ORDER]
+
+
+def nearest_station(lat: float, lon: float) -> dict:
+    """
+    Estación más cercana a un punto (aproximación equirectangular).
+
+    Returns:
+        Diccionario de la estación en STATIONS
+    """
+    dlat = _lats32_h - np.float32(lat)
+    dlon = (_lons32_h - np.float32(lon)) * np.float32(np.cos(np.radians(lat)))
+    return STATIONS[int(HILBERT_ORDER[np.argmin(dlat * dlat + dlon * dlon)])]
+
+
+EARTH_RADIUS_KM = 6371.0
+
+# Trigonometría precalculada: cada estación como vector unitario 3D (x, y, z).
+# cos(ángulo central) = producto punto, así cada consulta es solo mul+add (BLAS) y un arccos.
+_lats_rad = np.deg2rad(_lats)
+_lons_rad = np.deg2rad(_lons)
+_sin_lats = np.sin(_lats_rad)
+_cos_lats = np.cos(_lats_rad)
+_unit_xyz = np.column_stack([_cos_lats * np.cos(_lons_rad), _cos_lats * np.sin(_lons_rad), _sin_lats])
+
+
+def _to_unit(lats_deg, lons_deg) -> np.ndarray:
+    """Coordenadas en grados -> vectores unitarios (M, 3)."""
+    phi = np.deg2rad(lats_deg)
+    lam = np.deg2rad(lons_deg)
+    cos_phi = np.cos(phi)
+    return np.column_stack([cos_phi * np.cos(lam), cos_phi * np.sin(lam), np.sin(phi)])
+
+
+def distance_to_all(lat: float, lon: float) -> np.ndarray:
+    """
+    Distancia (km) desde un punto a todas las estaciones.
+
+    Returns:
+        Arreglo float32 de largo len(STATIONS), alineado con STATIONS
+    """
+    cos_angle = _unit_xyz @ _to_unit([lat], [lon])[0]
+    np.clip(cos_angle, -1.0, 1.0, out=cos_angle)
+    return (EARTH_RADIUS_KM * np.arccos(cos_angle, out=cos_angle)).astype(np.float32)
+
+
+def distance_matrix(points_latlon) -> np.ndarray:
+    """
+    Distancias (km) de un lote de puntos a todas las estaciones.
+
+    Args:
+        points_latlon: Arreglo (M, 2) de [lat, lon] en grados
+
+    Returns:
+        Arreglo float32 (M, len(STATIONS))
+    """
+    points = np.atleast_2d(np.asarray(points_latlon, dtype=np.float64))
+    cos_angle = _to_unit(points[:, 0], points[:, 1]) @ _unit_xyz.T
+    np.clip(cos_angle, -1.0, 1.0, out=cos_angle)
+    return (EARTH_RADIUS_KM * np.arccos(cos_angle, out=cos_angle)).astype(np.float32)
+
+
+def nearest_rows(points_latlon) -> np.ndarray:
+    """
+    Estación más cercana (distancia de gran círculo) para un lote de puntos.
+
+    Maximiza el producto punto entre vectores unitarios: sin arccos y todo el trabajo en
+    NumPy/BLAS, que liberan el GIL, por lo que varios hilos pueden ejecutarlo en paralelo.
+
+    Args:
+        points_latlon: Arreglo (M, 2) de [lat, lon] en grados
+
+    Returns:
+        Arreglo int32 (M,) de posiciones en STATIONS
+    """
+    points = np.atleast_2d(np.asarray(points_latlon, dtype=np.float64))
+    return np.argmax(_to_unit(points[:, 0], points[:, 1]) @ _unit_xyz.T, axis=1).astype(np.int32)
+
+
+# Índice BallTree (haversine) sobre las estaciones, construido en el primer uso
+_station_tree = None
+
+
+def get_station_tree():
+    """Obtiene el BallTree singleton sobre las coordenadas (en radianes)."""
+    global _station_tree
+    if _station_tree is None:
+        from sklearn.neighbors import BallTree
+        coords_rad = np.deg2rad(np.column_stack([_lats, _lons]))
+        _station_tree = BallTree(coords_rad, metric="haversine")
+    return _station_tree
+
+
+def query_nearest(points_latlon, k: int = 1):
+    """
+    k estaciones más cercanas para un lote de puntos.
+
+    Args:
+        points_latlon: Arreglo (M, 2) de [lat, lon] en grados
+        k: Número de vecinos por punto
+
+    Returns:
+        Tuple (distancias_km (M, k), índices (M, k) en STATIONS / arreglos SoA)
+    """
+    points_rad = np.deg2rad(np.atleast_2d(np.asarray(points_latlon, dtype=np.float64)))
+    dist, idx = get_station_tree().query(points_rad, k=k)
+    return dist * EARTH_RADIUS_KM, idx
+
+
+# Todos los arreglos del módulo son de solo lectura: compartidos entre hilos sin copias y,
+# con un proceso maestro que precargue la app (fork), sus páginas no se duplican por worker.
+for _arr in (
+    _ids, _lats, _lons, _elev, _lats32, _lons32, _elev32, STATIONS_ARRAY,
+    _lats32_h, _lons32_h, HILBERT_ORDER, _lats_rad, _lons_rad, _sin_lats, _cos_lats, _unit_xyz,
+    _EMPTY_INDEX, *STATIONS_BY_REGION.values(), *STATIONS_BY_TIPO.values(), *STATION_GRID.values(),
+):
+    _arr.setflags(write=False)
+del _arr
@@ -8,25 +8,455 @@ Implementa:
 """
 
 import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
 import logging
 
+import numpy as np
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 # Path a la base de datos
 DATABASE_PATH = Path(__file__).parent.parent / "database" / "raindrop.db"
 DATABASE_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+# Espera máxima (segundos) cuando otra conexión tiene la BD bloqueada
+BUSY_TIMEOUT = 5.0
+
+# Sentencias compiladas que guarda cada conexión (default de sqlite3: 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Filas borradas por transacción en cleanup_old_data
+CLEANUP_CHUNK_SIZE = 1000
+
+# Ventanas por consulta en iter_data_by_station_windows (3 parámetros cada una;
+# SQLite admite hasta 32766 parámetros por sentencia)
+MAX_WINDOWS_PER_QUERY = 10000
+
+# Conexión reutilizable por hilo (sqlite3 no comparte conexiones entre hilos)
+_local = threading.local()
+
+# Vigencia (segundos) de la lista de estaciones en memoria; la tabla stations
+# solo cambia con scripts/scrape_stations.py, que corre en otro proceso
+STATIONS_CACHE_SECONDS = 60.0
+
+# (vence, ruta de la BD, estaciones) de la última consulta de get_all_stations
+_stations_cache: Optional[Tuple[float, Path, Tuple[Dict, ...]]] = None
+
+# Versión de active_alerts en este proceso: cada escritura la incrementa y
+# así invalida el caché de get_all_alerts_by_station
+_alerts_version = 0
+
+# Ventana de mmap para lecturas sin read() ni copia al caché de páginas (256 MB);
+# desactivada en procesos de 32 bits, donde el espacio de direcciones no alcanza
+MMAP_SIZE = 256 * 1024 * 1024 if sys.maxsize > 2**32 else 0
+
+# PRAGMAs por conexión: fsync solo en checkpoints de WAL, temporales en RAM,
+# caché de páginas de 64 MB y lecturas por mmap
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    f"PRAGMA mmap_size={MMAP_SIZE}",
+)
+
+
+def _connect() -> sqlite3.Connection:
+    """
+    Devuelve la conexión a la base de datos del hilo actual, creándola si hace falta.
+    
+    La conexión se reutiliza entre llamadas, así que el caché de sentencias de
+    sqlite3 evita volver a compilar el SQL de las consultas frecuentes. No se
+    debe cerrar: se cierra con close_connection() o al terminar el hilo.
+    
+    journal_mode=WAL queda guardado en el archivo (init_database); el resto de
+    PRAGMAs y busy_timeout son por conexión y se aplican al crearla.
+    
+    Returns:
+        Conexión sqlite3 lista para usar
+    """
+    conn = getattr(_local, "conn", None)
+    
+    if conn is None or _local.path != DATABASE_PATH:
+        if conn is not None:
+            conn.close()
+        conn = sqlite3.connect(
+            DATABASE_PATH,
+            timeout=BUSY_TIMEOUT,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        _local.conn = conn
+        _local.path = DATABASE_PATH
+    elif conn.in_transaction:
+        # Transacción abandonada por una llamada anterior que falló
+        conn.rollback()
+    
+    # Cada función elige su row_factory; no heredar la de la llamada anterior
+    conn.row_factory = None
+    return conn
+
+
+def close_connection():
+    """Cierra la conexión del hilo actual (p. ej. antes de borrar el archivo de la BD)."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        # Recomendación de SQLite: actualizar estadísticas que lo necesiten al cerrar
+        conn.execute("PRAGMA optimize")
+        conn.close()
+        _local.conn = None
+
+
+# Índices que repetían las columnas (o el prefijo) de una restricción UNIQUE
+# (ya auto-indexada); init_database los elimina de bases existentes
+_REDUNDANT_INDEXES = ("idx_station_date_hour", "idx_forecast_station_date", "idx_alert_station")
+
+# Clave entera ordenable de fecha+hora: 'YYYY-MM-DD', H -> YYYYMMDDHH
+_DATE_HOUR_KEY_SQL = "CAST(REPLACE(date, '-', '') AS INTEGER) * 100 + hour"
+
+# Epoch Unix actual en segundos (unixepoch() solo existe desde SQLite 3.38)
+_UNIX_NOW_SQL = "CAST(strftime('%s', 'now') AS INTEGER)"
+
+# Columnas de weather_hourly agregadas después del schema original
+# (se agregan a bases existentes en init_database)
+_WEATHER_ADDED_COLUMNS = (
+    ("flood_probability", "REAL DEFAULT 0.0"),
+    ("flood_level", "TEXT DEFAULT 'GREEN'"),
+    ("drought_probability", "REAL DEFAULT 0.0"),
+    ("drought_level", "TEXT DEFAULT 'GREEN'"),
+    # VIRTUAL: ALTER TABLE no admite columnas STORED; el índice guarda los valores
+    ("date_hour_key", f"INTEGER GENERATED ALWAYS AS ({_DATE_HOUR_KEY_SQL}) VIRTUAL"),
+)
+
+# Upsert por estación+fecha+hora: deduplicación automática
+# (created_at/updated_at los pone SQLite con _UNIX_NOW_SQL, no son parámetros)
+_WEATHER_UPSERT_SQL = f"""
+    INSERT INTO weather_hourly (
+        station_id, station_name, region, latitude, longitude, elevation,
+        date, hour, timestamp,
+        temperature, feels_like, humidity,
+        wind_speed, wind_direction, wind_angle,
+        precipitation_total, precipitation_type,
+        pressure, cloud_cover, summary, icon,
+        flood_probability, flood_level,
+        drought_probability, drought_level,
+        created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {_UNIX_NOW_SQL}, {_UNIX_NOW_SQL})
+    ON CONFLICT(station_id, date, hour) 
+    DO UPDATE SET
+        timestamp = excluded.timestamp,
+        temperature = excluded.temperature,
+        feels_like = excluded.feels_like,
+        humidity = excluded.humidity,
+        wind_speed = excluded.wind_speed,
+        wind_direction = excluded.wind_direction,
+        wind_angle = excluded.wind_angle,
+        precipitation_total = excluded.precipitation_total,
+        precipitation_type = excluded.precipitation_type,
+        pressure = excluded.pressure,
+        cloud_cover = excluded.cloud_cover,
+        summary = excluded.summary,
+        icon = excluded.icon,
+        flood_probability = excluded.flood_probability,
+        flood_level = excluded.flood_level,
+        drought_probability = excluded.drought_probability,
+        drought_level = excluded.drought_level,
+        updated_at = {_UNIX_NOW_SQL}
+"""
+
+# Upsert por estación+fecha de pronóstico
+_FORECAST_UPSERT_SQL = f"""
+    INSERT INTO weather_forecast (
+        station_id, station_name, region, latitude, longitude, elevation,
+        forecast_date, temp_max, temp_min, temp_avg, humidity,
+        wind_speed_max, wind_direction, wind_angle,
+        precipitation_total, precipitation_probability,
+        pressure, cloud_cover, summary, icon,
+        flood_probability, drought_probability, risk_bits,
+        retrieved_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(station_id, forecast_date) DO UPDATE SET
+        temp_max = excluded.temp_max,
+        temp_min = excluded.temp_min,
+        temp_avg = excluded.temp_avg,
+        humidity = excluded.humidity,
+        wind_speed_max = excluded.wind_speed_max,
+        wind_direction = excluded.wind_direction,
+        wind_angle = excluded.wind_angle,
+        precipitation_total = excluded.precipitation_total,
+        precipitation_probability = excluded.precipitation_probability,
+        pressure = excluded.pressure,
+        cloud_cover = excluded.cloud_cover,
+        summary = excluded.summary,
+        icon = excluded.icon,
+        flood_probability = excluded.flood_probability,
+        drought_probability = excluded.drought_probability,
+        risk_bits = excluded.risk_bits,
+        retrieved_at = excluded.retrieved_at,
+        updated_at = {_UNIX_NOW_SQL}
+"""
+
+
+# INSERT sin ON CONFLICT para recargas masivas sobre tablas vacías (bulk=True)
+_WEATHER_INSERT_SQL = _WEATHER_UPSERT_SQL[:_WEATHER_UPSERT_SQL.index("ON CONFLICT")]
+_FORECAST_INSERT_SQL = _FORECAST_UPSERT_SQL[:_FORECAST_UPSERT_SQL.index("ON CONFLICT")]
+
+# Columnas de weather_forecast en el orden de _FORECAST_UPSERT_SQL, sin retrieved_at
+# (la última): si todas coinciden con la BD, el registro no cambió
+_FORECAST_DATA_COLUMNS = (
+    "station_id", "station_name", "region", "latitude", "longitude", "elevation",
+    "forecast_date", "temp_max", "temp_min", "temp_avg", "humidity",
+    "wind_speed_max", "wind_direction", "wind_angle",
+    "precipitation_total", "precipitation_probability",
+    "pressure", "cloud_cover", "summary", "icon",
+    "flood_probability", "drought_probability", "risk_bits",
+)
+
+# Registros sin cambios: solo se actualiza retrieved_at (última descarga);
+# updated_at sigue indicando el último cambio de datos
+_FORECAST_TOUCH_SQL = """
+    UPDATE weather_forecast SET retrieved_at = ?
+    WHERE station_id = ? AND forecast_date = ?
+"""
+
+# Columnas numéricas de weather_forecast para get_forecast_matrix (NULL -> NaN)
+_FORECAST_MATRIX_DTYPE = np.dtype([
+    ("station_id", "i4"),
+    ("forecast_date", "U10"),
+    ("temp_max", "f8"),
+    ("temp_min", "f8"),
+    ("temp_avg", "f8"),
+    ("humidity", "f8"),
+    ("wind_speed_max", "f8"),
+    ("wind_angle", "f8"),
+    ("precipitation_total", "f8"),
+    ("precipitation_probability", "f8"),
+    ("pressure", "f8"),
+    ("cloud_cover", "f8"),
+    ("flood_probability", "f8"),
+    ("drought_probability", "f8"),
+    ("risk_bits", "i4"),
+])
+_FORECAST_MATRIX_COLUMNS = ", ".join(
+    "COALESCE(risk_bits, 0)" if name == "risk_bits" else name
+    for name in _FORECAST_MATRIX_DTYPE.names
+)
+
+# Niveles de riesgo y su código en risk_bits
+RISK_LEVELS = ("GREEN", "YELLOW", "RED")
+_RISK_LEVEL_CODES = {level: code for code, level in enumerate(RISK_LEVELS)}
+
+# Backfill de risk_bits desde las columnas de nivel/alerta de bases anteriores
+_RISK_BITS_BACKFILL_SQL = """
+    UPDATE weather_forecast SET risk_bits =
+        (CASE flood_level WHEN 'YELLOW' THEN 1 WHEN 'RED' THEN 2 ELSE 0 END)
+        | ((COALESCE(flood_alert, 0) != 0) << 4)
+        | ((CASE drought_level WHEN 'YELLOW' THEN 1 WHEN 'RED' THEN 2 ELSE 0 END) << 5)
+        | ((COALESCE(drought_alert, 0) != 0) << 9)
+"""
+
+# PRAGMA user_version desde el que created_at/updated_at de weather_hourly y
+# weather_forecast guardan epoch Unix (bases anteriores: texto ISO)
+_EPOCH_TIMESTAMPS_VERSION = 1
+
+# Conversión única de los valores ISO ('YYYY-MM-DD...') a epoch Unix
+_EPOCH_TIMESTAMPS_BACKFILL_SQL = tuple(
+    f"""
+    UPDATE {table} SET {column} = CAST(strftime('%s', {column}) AS INTEGER)
+    WHERE {column} LIKE '____-__-__%' AND strftime('%s', {column}) IS NOT NULL
+    """
+    for table in ("weather_hourly", "weather_forecast")
+    for column in ("created_at", "updated_at")
+)
+
+
+def encode_risk_bits(
+    flood_level: str,
+    flood_alert: bool,
+    drought_level: str,
+    drought_alert: bool
+) -> int:
+    """
+    Empaqueta niveles y alertas de riesgo en un entero (columna risk_bits).
+    
+    Bits 0-3: nivel de inundación, 4: alerta de inundación,
+    5-8: nivel de sequía, 9: alerta de sequía. Niveles desconocidos -> GREEN.
+    
+    Returns:
+        Entero con los campos empaquetados
+    """
+    return (
+        _RISK_LEVEL_CODES.get(flood_level, 0)
+        | (bool(flood_alert) << 4)
+        | (_RISK_LEVEL_CODES.get(drought_level, 0) << 5)
+        | (bool(drought_alert) << 9)
+    )
+
+
+def decode_risk_bits(bits: Optional[int]) -> Dict:
+    """
+    Desempaqueta risk_bits en los campos flood_level, flood_alert, drought_level
+    y drought_alert (mismo formato que las columnas que reemplaza).
+    """
+    bits = bits or 0
+    return {
+        "flood_level": RISK_LEVELS[bits & 0xF],
+        "flood_alert": (bits >> 4) & 1,
+        "drought_level": RISK_LEVELS[(bits >> 5) & 0xF],
+        "drought_alert": (bits >> 9) & 1,
+    }
+
+
+def _forecast_record(row: sqlite3.Row) -> Dict:
+    """Fila de weather_forecast -> dict con los campos de riesgo desempaquetados"""
+    record = dict(row)
+    record.update(decode_risk_bits(record.pop("risk_bits", 0)))
+    return record
+
+
+def _upsert_many(table: str, sql: str, rows: List[tuple], label: str) -> Tuple[int, int]:
+    """
+    Ejecuta un upsert para todas las filas con executemany en una sola transacción.
+    
+    Si el lote falla (p. ej. una fila viola NOT NULL), se revierte y se reintenta
+    fila por fila para guardar las válidas y registrar las que fallan.
+    
+    Las inserciones se cuentan por rowid: con AUTOINCREMENT las filas nuevas
+    quedan por encima del MAX(rowid) previo y un DO UPDATE conserva el suyo
+    (executemany descarta las filas de RETURNING, así que no sirve para contar).
+    
+    Args:
+        table: Tabla destino (con id INTEGER PRIMARY KEY AUTOINCREMENT)
+        sql: Sentencia INSERT ... ON CONFLICT con placeholders
+        rows: Tuplas de parámetros (station_id en la primera posición)
+        label: Descripción de los registros para los mensajes de error
+        
+    Returns:
+        Tuple (filas guardadas, filas insertadas); el resto fueron actualizadas
+    """
+    if not rows:
+        return 0, 0
+    
+    conn = _connect()
+    try:
+        # Un solo programa compilado reutilizado para todas las filas
+        with conn:
+            # IMMEDIATE: ningún otro escritor inserta entre las dos lecturas de rowid
+            conn.execute("BEGIN IMMEDIATE")
+            last_rowid = _max_rowid(conn, table)
+            conn.executemany(sql, rows)
+            return len(rows), _count_inserted(conn, table, last_rowid)
+    except sqlite3.Error as e:
+        logger.warning(f" Lote de {len(rows)} filas falló ({e}), reintentando fila por fila")
+    
+    saved = 0
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        last_rowid = _max_rowid(conn, table)
+        for row in rows:
+            try:
+                conn.execute(sql, row)
+                saved += 1
+            except sqlite3.Error as e:
+                logger.error(f" Error insertando {label} {row[0]}: {e}")
+        return saved, _count_inserted(conn, table, last_rowid)
+
+
+def _insert_many_unjournaled(table: str, sql: str, rows: List[tuple]) -> int:
+    """
+    Inserta todas las filas en una tabla vacía dentro de bulk_rebuild_context().
+    
+    Sin journal ROLLBACK no está definido, así que no hay reintento fila por
+    fila: si el lote falla se confirma lo escrito y se propaga el error (la
+    recarga se repite desde la tabla vacía).
+    
+    Args:
+        table: Tabla destino (debe estar vacía)
+        sql: Sentencia INSERT simple con placeholders
+        rows: Tuplas de parámetros
+        
+    Returns:
+        Filas insertadas
+    """
+    if not rows:
+        return 0
+    
+    conn = _connect()
+    if conn.execute(f"SELECT EXISTS (SELECT 1 FROM {table})").fetchone()[0]:
+        raise ValueError(f"La recarga masiva requiere la tabla {table} vacía")
+    
+    conn.execute("BEGIN")
+    try:
+        conn.executemany(sql, rows)
+    finally:
+        conn.commit()
+    return len(rows)
+
+
+def _max_rowid(conn: sqlite3.Connection, table: str) -> int:
+    """Último rowid de la tabla (0 si está vacía)."""
+    return conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}").fetchone()[0]
+
+
+def _count_inserted(conn: sqlite3.Connection, table: str, last_rowid: int) -> int:
+    """Filas con rowid posterior a last_rowid (búsqueda por rango en la clave)."""
+    return conn.execute(
+        f"SELECT COUNT(*) FROM {table} WHERE rowid > ?", (last_rowid,)
+    ).fetchone()[0]
+
+
+@contextmanager
+def bulk_rebuild_context() -> Iterator[sqlite3.Connection]:
+    """
+    Desactiva journal y fsync en la conexión del hilo durante una recarga masiva.
+    
+    Solo para recargar tablas vacías con INSERT simple (bulk=True en las
+    funciones de inserción): sin journal no hay ROLLBACK, y las escrituras del
+    bloque no son recuperables ante un corte. No usar con upserts sobre la BD en
+    uso. Al salir se restauran WAL y los PRAGMAs normales. Si otra conexión tiene
+    la BD abierta, SQLite no permite salir de WAL y solo se aplica synchronous=OFF.
+    
+    Yields:
+        Conexión del hilo (la misma que usan las funciones de inserción)
+    """
+    conn = _connect()
+    foreign_keys = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+    
+    mode = conn.execute("PRAGMA journal_mode=OFF").fetchone()[0]
+    if mode != "off":
+        logger.warning(f" journal_mode sigue en '{mode}' (BD en uso por otra conexión)")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA foreign_keys=OFF")
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            # ROLLBACK sin journal no está definido: confirmar lo escrito
+            logger.warning(" Recarga masiva interrumpida: repetirla sobre la tabla vacía")
+            conn.commit()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA foreign_keys={foreign_keys}")
+
 
 def init_database():
     """Inicializa el schema de la base de datos."""
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = _connect()
     cursor = conn.cursor()
     
+    # WAL: lectores concurrentes con un escritor (persistente en el archivo)
+    cursor.execute("PRAGMA journal_mode=WAL")
+    
     # Tabla principal de datos climáticos con índice único por estación+fecha+hora
-    cursor.execute("""
+    cursor.execute(f"""
         CREATE TABLE IF NOT EXISTS weather_hourly (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             station_id INTEGER NOT NULL,
@@ -55,24 +485,42 @@ def init_database():
             summary TEXT,
             icon TEXT,
             
-            -- Metadata
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL,
+            -- Riesgo pre-calculado
+            flood_probability REAL DEFAULT 0.0,
+            flood_level TEXT DEFAULT 'GREEN',
+            drought_probability REAL DEFAULT 0.0,
+            drought_level TEXT DEFAULT 'GREEN',
+            
+            -- Metadata (epoch Unix; bases anteriores guardan texto ISO)
+            created_at INTEGER DEFAULT ({_UNIX_NOW_SQL}),
+            updated_at INTEGER DEFAULT ({_UNIX_NOW_SQL}),
+            
+            -- Fecha+hora como entero YYYYMMDDHH (indexado para MAX por estación)
+            date_hour_key INTEGER GENERATED ALWAYS AS ({_DATE_HOUR_KEY_SQL}) VIRTUAL,
             
             -- Constraint único: una sola lectura por estación por hora
             UNIQUE(station_id, date, hour)
         )
     """)
     
+    # Columnas nuevas en bases de datos creadas antes de agregarlas al schema
+    # (table_xinfo incluye las columnas generadas)
+    cursor.execute("PRAGMA table_xinfo(weather_hourly)")
+    existing_columns = {col[1] for col in cursor.fetchall()}
+    for col_name, col_type in _WEATHER_ADDED_COLUMNS:
+        if col_name not in existing_columns:
+            cursor.execute(f"ALTER TABLE weather_hourly ADD COLUMN {col_name} {col_type}")
+    
     # Índices para optimizar consultas
+    # ((station_id, date, hour) ya está indexado por la restricción UNIQUE)
     cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_station_date_hour 
-        ON weather_hourly(station_id, date, hour)
+        CREATE INDEX IF NOT EXISTS idx_date_hour 
+        ON weather_hourly(date, hour)
     """)
     
     cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_date_hour 
-        ON weather_hourly(date, hour)
+        CREATE INDEX IF NOT EXISTS idx_station_date_hour_key 
+        ON weather_hourly(station_id, date_hour_key DESC)
     """)
     
     cursor.execute("""
@@ -120,7 +568,7 @@ def init_database():
     """)
     
     # Tabla de pronósticos (forecast de 7 días)
-    cursor.execute("""
+    cursor.execute(f"""
         CREATE TABLE IF NOT EXISTS weather_forecast (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             station_id INTEGER NOT NULL,
@@ -150,28 +598,38 @@ def init_database():
             
             -- Riesgos pre-calculados (para carga rápida)
             flood_probability REAL DEFAULT 0.0,
-            flood_level TEXT DEFAULT 'GREEN',
-            flood_alert INTEGER DEFAULT 0,
             drought_probability REAL DEFAULT 0.0,
-            drought_level TEXT DEFAULT 'GREEN',
-            drought_alert INTEGER DEFAULT 0,
+            -- Niveles y alertas empaquetados (encode_risk_bits): bits 0-3 nivel de
+            -- inundación, 4 alerta, 5-8 nivel de sequía, 9 alerta
+            risk_bits INTEGER DEFAULT 0,
             
             -- Metadata
             retrieved_at TEXT NOT NULL,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            created_at INTEGER DEFAULT ({_UNIX_NOW_SQL}),
+            updated_at INTEGER DEFAULT ({_UNIX_NOW_SQL}),
             
             -- Constraint único: un pronóstico por estación por día
             UNIQUE(station_id, forecast_date)
         )
     """)
     
-    # Índices para forecasts
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_forecast_station_date 
-        ON weather_forecast(station_id, forecast_date)
-    """)
+    # Bases anteriores: niveles/alertas en columnas TEXT/INTEGER -> risk_bits
+    cursor.execute("PRAGMA table_info(weather_forecast)")
+    forecast_columns = {col[1] for col in cursor.fetchall()}
+    if "risk_bits" not in forecast_columns:
+        cursor.execute("ALTER TABLE weather_forecast ADD COLUMN risk_bits INTEGER DEFAULT 0")
+        if "flood_level" in forecast_columns:
+            cursor.execute(_RISK_BITS_BACKFILL_SQL)
+    
+    # Bases anteriores: created_at/updated_at en texto ISO -> epoch Unix (una sola vez;
+    # CREATE TABLE IF NOT EXISTS no cambia las tablas existentes)
+    if cursor.execute("PRAGMA user_version").fetchone()[0] < _EPOCH_TIMESTAMPS_VERSION:
+        for sql in _EPOCH_TIMESTAMPS_BACKFILL_SQL:
+            cursor.execute(sql)
+        cursor.execute(f"PRAGMA user_version = {_EPOCH_TIMESTAMPS_VERSION}")
     
+    # Índices para forecasts
+    # ((station_id, forecast_date) ya está indexado por la restricción UNIQUE)
     cursor.execute("""
         CREATE INDEX IF NOT EXISTS idx_forecast_date 
         ON weather_forecast(forecast_date)
@@ -205,11 +663,8 @@ def init_database():
     """)
     
     # Índices para alertas
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_alert_station 
-        ON active_alerts(station_id)
-    """)
-    
+    # ((station_id, alert_type) ya está indexado por la restricción UNIQUE, que
+    # también sirve las búsquedas solo por station_id)
     cursor.execute("""
         CREATE INDEX IF NOT EXISTS idx_alert_type 
         ON active_alerts(alert_type)
@@ -220,13 +675,20 @@ def init_database():
         ON active_alerts(triggered_at DESC)
     """)
     
+    # Índices duplicados de versiones anteriores (mismas columnas que un UNIQUE)
+    for index_name in _REDUNDANT_INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+    
     conn.commit()
-    conn.close()
+    
+    # Estadísticas para el planificador (muestreo acotado: barato en tablas grandes)
+    cursor.execute("PRAGMA analysis_limit=1000")
+    cursor.execute("ANALYZE")
     
     logger.info(f" Base de datos inicializada: {DATABASE_PATH}")
 
 
-def insert_or_update_weather_data(weather_data: List[Dict]) -> int:
+def insert_or_update_weather_data(weather_data: List[Dict], bulk: bool = False) -> int:
     """
     Inserta o actualiza datos climáticos.
     
@@ -235,66 +697,29 @@ def insert_or_update_weather_data(weather_data: List[Dict]) -> int:
     
     Args:
         weather_data: Lista de diccionarios con datos climáticos
+        bulk: Recarga masiva sobre tabla vacía: INSERT simple (sin ON CONFLICT)
+              dentro de bulk_rebuild_context()
         
     Returns:
         Número de registros insertados/actualizados
     """
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    inserted = 0
-    updated = 0
+    rows = []
     
     for data in weather_data:
         try:
-            # Parsear timestamp y extraer fecha y hora
-            timestamp = datetime.fromisoformat(data['timestamp'].replace('Z', '+00:00'))
-            date_str = timestamp.strftime('%Y-%m-%d')
-            hour = timestamp.hour
-            
-            now = datetime.now(timezone.utc).isoformat()
+            # Fecha y hora directamente del string ISO 8601 ('YYYY-MM-DDTHH:...')
+            timestamp = data['timestamp']
+            date_str = timestamp[:10]
+            hour = int(timestamp[11:13])
             
-            # Usar INSERT OR REPLACE para deduplicación automática
-            cursor.execute("""
-                INSERT INTO weather_hourly (
-                    station_id, station_name, region, latitude, longitude, elevation,
-                    date, hour, timestamp,
-                    temperature, feels_like, humidity,
-                    wind_speed, wind_direction, wind_angle,
-                    precipitation_total, precipitation_type,
-                    pressure, cloud_cover, summary, icon,
-                    flood_probability, flood_level,
-                    drought_probability, drought_level,
-                    created_at, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(station_id, date, hour) 
-                DO UPDATE SET
-                    timestamp = excluded.timestamp,
-                    temperature = excluded.temperature,
-                    feels_like = excluded.feels_like,
-                    humidity = excluded.humidity,
-                    wind_speed = excluded.wind_speed,
-                    wind_direction = excluded.wind_direction,
-                    wind_angle = excluded.wind_angle,
-                    precipitation_total = excluded.precipitation_total,
-                    precipitation_type = excluded.precipitation_type,
-                    pressure = excluded.pressure,
-                    cloud_cover = excluded.cloud_cover,
-                    summary = excluded.summary,
-                    icon = excluded.icon,
-                    flood_probability = excluded.flood_probability,
-                    flood_level = excluded.flood_level,
-                    drought_probability = excluded.drought_probability,
-                    drought_level = excluded.drought_level,
-                    updated_at = excluded.updated_at
-            """, (
+            rows.append((
                 data['station_id'], 
                 data.get('station_name', f"Estación {data['station_id']}"), 
                 data.get('region', 'Panama'),
                 data.get('latitude'), 
                 data.get('longitude'), 
                 data.get('elevation'),
-                date_str, hour, data['timestamp'],
+                date_str, hour, timestamp,
                 data.get('temperature'), data.get('feels_like'), data.get('humidity'),
                 data.get('wind_speed'), data.get('wind_direction'), data.get('wind_angle'),
                 data.get('precipitation_total'), data.get('precipitation_type'),
@@ -302,56 +727,175 @@ def insert_or_update_weather_data(weather_data: List[Dict]) -> int:
                 data.get('summary'), data.get('icon'),
                 data.get('flood_probability', 0.0), data.get('flood_level', 'GREEN'),
                 data.get('drought_probability', 0.0), data.get('drought_level', 'GREEN'),
-                now, now
             ))
-            
-            if cursor.rowcount > 0:
-                # Si rowcount es 1, fue INSERT, si es 2 fue UPDATE (SQLite behavior)
-                if cursor.lastrowid > 0:
-                    inserted += 1
-                else:
-                    updated += 1
-                    
         except Exception as e:
             logger.error(f"Error insertando datos de estación {data.get('station_id')}: {e}")
-            continue
     
-    conn.commit()
-    conn.close()
+    if bulk:
+        with bulk_rebuild_context():
+            saved = inserted = _insert_many_unjournaled("weather_hourly", _WEATHER_INSERT_SQL, rows)
+    else:
+        saved, inserted = _upsert_many(
+            "weather_hourly", _WEATHER_UPSERT_SQL, rows, "datos de estación"
+        )
     
-    logger.info(f" Datos guardados: {inserted} nuevos, {updated} actualizados")
-    return inserted + updated
+    logger.info(
+        f" Datos guardados: {inserted} registros insertados, "
+        f"{saved - inserted} actualizados"
+    )
+    return saved
 
 
-def get_latest_data_by_station(station_id: int, limit: int = 24) -> List[Dict]:
+def get_latest_data_by_station(station_id: int, limit: int = 24, as_dict: bool = True) -> List[Dict]:
     """
     Obtiene los últimos registros de una estación.
     
     Args:
         station_id: ID de la estación
         limit: Número máximo de registros (default: últimas 24 horas)
+        as_dict: Si es False, devuelve los sqlite3.Row sin convertir (acceso por
+                 nombre o índice, sin crear un dict por fila)
         
     Returns:
         Lista de registros ordenados por fecha y hora descendente
     """
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = _connect()
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
     cursor.execute("""
         SELECT * FROM weather_hourly
         WHERE station_id = ?
-        ORDER BY date DESC, hour DESC
+        ORDER BY date_hour_key DESC
         LIMIT ?
     """, (station_id, limit))
     
     rows = cursor.fetchall()
-    conn.close()
     
-    return [dict(row) for row in rows]
+    return [dict(row) for row in rows] if as_dict else rows
+
+
+def get_latest_update(station_id: int, limit: int = 24) -> Optional[Tuple[int, int, int]]:
+    """
+    Obtiene la marca de los últimos registros de una estación, sin leer sus datos.
+    
+    Cubre la misma ventana que get_latest_data_by_station(station_id, limit):
+    cambia si llega una hora nueva, si se corrige o rellena cualquier hora de la
+    ventana (MAX(updated_at)) o si cambia el número de registros.
+    
+    Args:
+        station_id: ID de la estación
+        limit: Número de registros de la ventana (default: últimas 24 horas)
+        
+    Returns:
+        Tuple (date_hour_key más reciente, MAX(updated_at), registros), o None si no hay datos
+    """
+    conn = _connect()
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+        SELECT MAX(date_hour_key), MAX(updated_at), COUNT(*) FROM (
+            SELECT date_hour_key, updated_at FROM weather_hourly
+            WHERE station_id = ?
+            ORDER BY date_hour_key DESC
+            LIMIT ?
+        )
+    """, (station_id, limit))
+    
+    row = cursor.fetchone()
+    
+    return tuple(row) if row[2] else None
+
+
+def get_latest_data_by_stations(
+    station_ids: Optional[List[int]] = None,
+    limit: int = 24,
+    as_dict: bool = True
+) -> Dict[int, List[Dict]]:
+    """
+    Obtiene los últimos registros de varias estaciones en una sola consulta.
+    
+    Args:
+        station_ids: IDs de las estaciones; None para todas las estaciones con datos
+        limit: Número máximo de registros por estación (default: últimas 24 horas)
+        as_dict: Si es False, devuelve los sqlite3.Row sin convertir (acceso por
+                 nombre o índice, sin crear un dict por fila)
+        
+    Returns:
+        Diccionario station_id -> lista de registros ordenados por fecha y hora descendente
+    """
+    if station_ids is None:
+        # Sin filtro IN: todas las estaciones en la misma consulta
+        grouped = {}
+        where_clause = ""
+        params = (limit,)
+    else:
+        grouped = {station_id: [] for station_id in station_ids}
+        if not station_ids:
+            return grouped
+        placeholders = ",".join("?" * len(station_ids))
+        where_clause = f"WHERE station_id IN ({placeholders})"
+        params = (*station_ids, limit)
+    
+    conn = _connect()
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    
+    cursor.execute(f"""
+        SELECT * FROM (
+            SELECT *, ROW_NUMBER() OVER (
+                PARTITION BY station_id ORDER BY date_hour_key DESC
+            ) AS row_num
+            FROM weather_hourly
+            {where_clause}
+        )
+        WHERE row_num <= ?
+        ORDER BY station_id, date_hour_key DESC
+    """, params)
+    
+    rows = cursor.fetchall()
+    
+    if not as_dict:
+        for row in rows:
+            grouped.setdefault(row["station_id"], []).append(row)
+        return grouped
+    
+    for row in rows:
+        record = dict(row)
+        del record["row_num"]
+        grouped.setdefault(record["station_id"], []).append(record)
+    
+    return grouped
+
 
+def get_station_ids_with_data() -> List[int]:
+    """
+    Obtiene los IDs de las estaciones que tienen registros horarios.
+    
+    Returns:
+        Lista de IDs de estación ordenada ascendentemente
+    """
+    conn = _connect()
+    cursor = conn.cursor()
+    
+    # DISTINCT sobre idx_station_id: se resuelve recorriendo solo el índice
+    cursor.execute("""
+        SELECT DISTINCT station_id
+        FROM weather_hourly
+        ORDER BY station_id
+    """)
+    
+    station_ids = [row[0] for row in cursor.fetchall()]
+    
+    return station_ids
 
-def get_data_by_date_range(start_date: str, end_date: str, station_id: Optional[int] = None) -> List[Dict]:
+
+def get_data_by_date_range(
+    start_date: str,
+    end_date: str,
+    station_id: Optional[int] = None,
+    as_dict: bool = True
+) -> List[Dict]:
     """
     Obtiene datos en un rango de fechas.
     
@@ -359,11 +903,13 @@ def get_data_by_date_range(start_date: str, end_date: str, station_id: Optional[
         start_date: Fecha inicio (YYYY-MM-DD)
         end_date: Fecha fin (YYYY-MM-DD)
         station_id: ID de estación (opcional, si no se proporciona obtiene todas)
+        as_dict: Si es False, devuelve los sqlite3.Row sin convertir (acceso por
+                 nombre o índice, sin crear un dict por fila)
         
     Returns:
         Lista de registros en el rango
     """
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = _connect()
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -382,103 +928,186 @@ def get_data_by_date_range(start_date: str, end_date: str, station_id: Optional[
         """, (start_date, end_date))
     
     rows = cursor.fetchall()
-    conn.close()
     
-    return [dict(row) for row in rows]
+    return [dict(row) for row in rows] if as_dict else rows
+
+
+def iter_data_by_station_windows(
+    windows: List[Tuple[int, int, int]],
+    columns: Tuple[str, ...]
+) -> Iterator[tuple]:
+    """
+    Recorre los registros de varias ventanas (estación, rango de date_hour_key)
+    con una sola consulta por lote de ventanas.
+    
+    Las ventanas se pasan como tabla VALUES y se unen con weather_hourly, así
+    cada una es un rango sobre idx_station_date_hour_key y solo se leen las
+    horas pedidas. Las filas se entregan como tuplas a medida que se leen del
+    cursor, sin materializar la lista completa (p. ej. para
+    pd.DataFrame.from_records).
+    
+    Args:
+        windows: Tuplas (station_id, start_key, end_key) con claves YYYYMMDDHH
+                 inclusivas; no deben solaparse (una fila saldría repetida)
+        columns: Columnas de weather_hourly a leer, en el orden de las tuplas
+        
+    Yields:
+        Tuplas con las columnas pedidas, ordenadas por estación, fecha y hora
+        dentro de cada lote
+    """
+    select_columns = ", ".join(f"h.{column}" for column in columns)
+    
+    conn = _connect()
+    
+    for offset in range(0, len(windows), MAX_WINDOWS_PER_QUERY):
+        batch = windows[offset:offset + MAX_WINDOWS_PER_QUERY]
+        values = ", ".join(["(?, ?, ?)"] * len(batch))
+        
+        cursor = conn.cursor()
+        cursor.arraysize = 1000
+        cursor.execute(f"""
+            WITH windows(station_id, start_key, end_key) AS (VALUES {values})
+            SELECT {select_columns}
+            FROM windows w
+            JOIN weather_hourly h
+                ON h.station_id = w.station_id
+                AND h.date_hour_key BETWEEN w.start_key AND w.end_key
+            ORDER BY h.station_id, h.date_hour_key
+        """, [value for window in batch for value in window])
+        
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            yield from rows
 
 
 def get_all_stations() -> List[Dict]:
     """
     Obtiene todas las estaciones desde la tabla stations.
     
+    La consulta se guarda en memoria durante STATIONS_CACHE_SECONDS; quien
+    modifique la tabla en este proceso debe llamar a invalidate_stations_cache().
+    
     Returns:
         Lista de diccionarios con información de todas las estaciones
+        (copias: el llamador puede modificarlas)
     """
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT 
-            id,
-            name,
-            region,
-            latitude as lat,
-            longitude as lon,
-            elevation
-        FROM stations
-        ORDER BY id
-    """)
-    
-    rows = cursor.fetchall()
-    conn.close()
-    
-    stations = []
-    for row in rows:
-        stations.append({
-            "id": row["id"],
-            "name": row["name"],
-            "region": row["region"],
-            "lat": row["lat"],
-            "lon": row["lon"],
-            "elevation": row["elevation"]
-        })
+    global _stations_cache
+    
+    now = time.monotonic()
+    cache = _stations_cache
+    if cache is None or now >= cache[0] or cache[1] != DATABASE_PATH:
+        conn = _connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT 
+                id,
+                name,
+                region,
+                latitude as lat,
+                longitude as lon,
+                elevation
+            FROM stations
+            ORDER BY id
+        """)
+        
+        stations = tuple(dict(row) for row in cursor.fetchall())
+        cache = _stations_cache = (now + STATIONS_CACHE_SECONDS, DATABASE_PATH, stations)
     
-    return stations
+    return [dict(station) for station in cache[2]]
+
+
+def invalidate_stations_cache() -> None:
+    """Descarta la lista de estaciones en memoria (tras modificar la tabla stations)."""
+    global _stations_cache
+    _stations_cache = None
 
 
-def get_all_stations_latest() -> List[Dict]:
+def get_all_stations_latest(as_dict: bool = True) -> List[Dict]:
     """
     Obtiene el último registro de cada estación.
-    OPTIMIZADO: Usa MAX() para mejor performance en tablas grandes.
+    OPTIMIZADO: una sola pasada en el orden de idx_station_date_hour_key
+    (ROW_NUMBER por estación, sin self-join ni ordenamiento extra).
     
+    Args:
+        as_dict: Si es False, devuelve los sqlite3.Row sin convertir (incluyen
+                 la columna auxiliar row_num)
+        
     Returns:
         Lista con el último dato de cada estación
     """
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = _connect()
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
-    # Query super optimizada usando MAX y GROUP BY
     cursor.execute("""
-        SELECT w.*
-        FROM weather_hourly w
-        INNER JOIN (
-            SELECT station_id, 
-                   MAX(date || ' ' || printf('%02d', hour)) as max_datetime
+        SELECT * FROM (
+            SELECT *, ROW_NUMBER() OVER (
+                PARTITION BY station_id ORDER BY date_hour_key DESC
+            ) AS row_num
             FROM weather_hourly
-            GROUP BY station_id
-        ) latest ON w.station_id = latest.station_id
-        AND (w.date || ' ' || printf('%02d', w.hour)) = latest.max_datetime
-        ORDER BY w.station_id
+        )
+        WHERE row_num = 1
+        ORDER BY station_id
     """)
     
     rows = cursor.fetchall()
-    conn.close()
+    if not as_dict:
+        return rows
     
-    return [dict(row) for row in rows]
+    latest = []
+    for row in rows:
+        record = dict(row)
+        del record["row_num"]
+        latest.append(record)
+    
+    return latest
 
 
-def cleanup_old_data(days_to_keep: int = 30):
+def cleanup_old_data(days_to_keep: int = 30, chunk_size: int = CLEANUP_CHUNK_SIZE):
     """
     Limpia datos antiguos para mantener solo los últimos N días.
     
+    Borra por lotes de chunk_size filas, cada uno en su propia transacción, para
+    no bloquear la escritura de la ingesta durante todo el borrado.
+    
     Args:
         days_to_keep: Número de días a mantener (default: 30)
+        chunk_size: Filas borradas por transacción
     """
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+    conn = _connect()
     
     cutoff_date = (datetime.now(timezone.utc) - timedelta(days=days_to_keep)).strftime('%Y-%m-%d')
     
-    cursor.execute("""
-        DELETE FROM weather_hourly
-        WHERE date < ?
-    """, (cutoff_date,))
+    deleted = 0
+    while True:
+        # BEGIN IMMEDIATE: toma el lock de escritura al inicio (sin upgrade fallido)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Sub-select resuelto con idx_date_hour (prefijo date)
+            cursor = conn.execute("""
+                DELETE FROM weather_hourly
+                WHERE rowid IN (
+                    SELECT rowid FROM weather_hourly
+                    WHERE date < ?
+                    LIMIT ?
+                )
+            """, (cutoff_date, chunk_size))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        
+        if cursor.rowcount <= 0:
+            break
+        deleted += cursor.rowcount
     
-    deleted = cursor.rowcount
-    conn.commit()
-    conn.close()
+    # Devolver al sistema el espacio del WAL generado por el borrado
+    if deleted:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
     
     logger.info(f" Limpieza completada: {deleted} registros antiguos eliminados")
     return deleted
@@ -500,7 +1129,7 @@ def insert_incident_report(incident_data: Dict) -> int:
     Returns:
         ID del reporte insertado
     """
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = _connect()
     cursor = conn.cursor()
     
     now = datetime.now(timezone.utc).isoformat()
@@ -524,7 +1153,6 @@ def insert_incident_report(incident_data: Dict) -> int:
     
     report_id = cursor.lastrowid
     conn.commit()
-    conn.close()
     
     logger.info(f" Reporte de incidencia creado: ID={report_id}, Tipo={incident_data['incident_type']}")
     return report_id
@@ -540,7 +1168,7 @@ def get_active_incident_reports(limit: int = 50) -> List[Dict]:
     Returns:
         Lista de reportes activos ordenados por fecha
     """
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = _connect()
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -552,7 +1180,6 @@ def get_active_incident_reports(limit: int = 50) -> List[Dict]:
     """, (limit,))
     
     rows = cursor.fetchall()
-    conn.close()
     
     return [dict(row) for row in rows]
 
@@ -568,7 +1195,7 @@ def get_all_incident_reports(status: Optional[str] = None, limit: int = 100) ->
     Returns:
         Lista de reportes
     """
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = _connect()
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -587,7 +1214,6 @@ def get_all_incident_reports(status: Optional[str] = None, limit: int = 100) ->
         """, (limit,))
     
     rows = cursor.fetchall()
-    conn.close()
     
     return [dict(row) for row in rows]
 
@@ -604,7 +1230,7 @@ def update_incident_status(incident_id: int, status: str, notes: Optional[str] =
     Returns:
         True si se actualizó correctamente
     """
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = _connect()
     cursor = conn.cursor()
     
     now = datetime.now(timezone.utc).isoformat()
@@ -624,7 +1250,6 @@ def update_incident_status(incident_id: int, status: str, notes: Optional[str] =
     
     updated = cursor.rowcount > 0
     conn.commit()
-    conn.close()
     
     if updated:
         logger.info(f" Reporte {incident_id} actualizado a estado: {status}")
@@ -632,113 +1257,143 @@ def update_incident_status(incident_id: int, status: str, notes: Optional[str] =
     return updated
 
 
-def insert_or_update_forecast_data(forecast_data: List[Dict]) -> int:
+def delete_incident_report(incident_id: int) -> bool:
+    """
+    Elimina un reporte de incidencia.
+    
+    Args:
+        incident_id: ID del reporte
+        
+    Returns:
+        True si el reporte existía y se eliminó
+    """
+    conn = _connect()
+    
+    with conn:
+        cursor = conn.execute("DELETE FROM incident_reports WHERE id = ?", (incident_id,))
+    
+    return cursor.rowcount > 0
+
+
+def insert_or_update_forecast_data(forecast_data: List[Dict], bulk: bool = False) -> int:
     """
     Inserta o actualiza datos de pronóstico en la base de datos.
     
     Args:
         forecast_data: Lista de diccionarios con datos de pronóstico
+        bulk: Recarga masiva sobre tabla vacía: INSERT simple (sin ON CONFLICT ni
+              comparación con lo guardado) dentro de bulk_rebuild_context()
         
     Returns:
         Número de registros procesados
     """
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    inserted = 0
-    updated = 0
-    
-    for record in forecast_data:
-        try:
-            # Insertar o actualizar
-            cursor.execute("""
-                INSERT INTO weather_forecast (
-                    station_id, station_name, region, latitude, longitude, elevation,
-                    forecast_date, temp_max, temp_min, temp_avg, humidity,
-                    wind_speed_max, wind_direction, wind_angle,
-                    precipitation_total, precipitation_probability,
-                    pressure, cloud_cover, summary, icon,
-                    flood_probability, flood_level, flood_alert,
-                    drought_probability, drought_level, drought_alert,
-                    retrieved_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(station_id, forecast_date) DO UPDATE SET
-                    temp_max = excluded.temp_max,
-                    temp_min = excluded.temp_min,
-                    temp_avg = excluded.temp_avg,
-                    humidity = excluded.humidity,
-                    wind_speed_max = excluded.wind_speed_max,
-                    wind_direction = excluded.wind_direction,
-                    wind_angle = excluded.wind_angle,
-                    precipitation_total = excluded.precipitation_total,
-                    precipitation_probability = excluded.precipitation_probability,
-                    pressure = excluded.pressure,
-                    cloud_cover = excluded.cloud_cover,
-                    summary = excluded.summary,
-                    icon = excluded.icon,
-                    flood_probability = excluded.flood_probability,
-                    flood_level = excluded.flood_level,
-                    flood_alert = excluded.flood_alert,
-                    drought_probability = excluded.drought_probability,
-                    drought_level = excluded.drought_level,
-                    drought_alert = excluded.drought_alert,
-                    retrieved_at = excluded.retrieved_at,
-                    updated_at = CURRENT_TIMESTAMP
-            """, (
-                record.get("station_id"),
-                record.get("station_name"),
-                record.get("region"),
-                record.get("latitude"),
-                record.get("longitude"),
-                record.get("elevation"),
-                record.get("forecast_date"),
-                record.get("temp_max"),
-                record.get("temp_min"),
-                record.get("temp_avg"),
-                record.get("humidity"),
-                record.get("wind_speed_max"),
-                record.get("wind_direction"),
-                record.get("wind_angle"),
-                record.get("precipitation_total"),
-                record.get("precipitation_probability"),
-                record.get("pressure"),
-                record.get("cloud_cover"),
-                record.get("summary"),
-                record.get("icon"),
-                record.get("flood_probability", 0.0),
+    rows = [
+        (
+            record.get("station_id"),
+            record.get("station_name"),
+            record.get("region"),
+            record.get("latitude"),
+            record.get("longitude"),
+            record.get("elevation"),
+            record.get("forecast_date"),
+            record.get("temp_max"),
+            record.get("temp_min"),
+            record.get("temp_avg"),
+            record.get("humidity"),
+            record.get("wind_speed_max"),
+            record.get("wind_direction"),
+            record.get("wind_angle"),
+            record.get("precipitation_total"),
+            record.get("precipitation_probability"),
+            record.get("pressure"),
+            record.get("cloud_cover"),
+            record.get("summary"),
+            record.get("icon"),
+            record.get("flood_probability", 0.0),
+            record.get("drought_probability", 0.0),
+            encode_risk_bits(
                 record.get("flood_level", "GREEN"),
-                1 if record.get("flood_alert", False) else 0,
-                record.get("drought_probability", 0.0),
+                record.get("flood_alert", False),
                 record.get("drought_level", "GREEN"),
-                1 if record.get("drought_alert", False) else 0,
-                record.get("retrieved_at"),
-            ))
-            
-            if cursor.rowcount == 1:
-                inserted += 1
-            else:
-                updated += 1
-                
-        except Exception as e:
-            logger.error(f" Error insertando forecast: {e}")
-            continue
+                record.get("drought_alert", False)
+            ),
+            record.get("retrieved_at"),
+        )
+        for record in forecast_data
+    ]
+    
+    if bulk:
+        with bulk_rebuild_context():
+            saved = _insert_many_unjournaled("weather_forecast", _FORECAST_INSERT_SQL, rows)
+        logger.info(f" Pronósticos guardados: {saved} registros insertados")
+        return saved
+    
+    # Los registros idénticos a los guardados (fetches repetidos del scheduler)
+    # no se reescriben: solo se marca su retrieved_at
+    changed_rows, unchanged_rows = _partition_forecast_rows(rows)
+    saved, inserted = _upsert_many(
+        "weather_forecast", _FORECAST_UPSERT_SQL, changed_rows, "forecast de estación"
+    )
+    if unchanged_rows:
+        conn = _connect()
+        with conn:
+            conn.executemany(
+                _FORECAST_TOUCH_SQL, [(row[-1], row[0], row[6]) for row in unchanged_rows]
+            )
+    
+    logger.info(
+        f" Pronósticos guardados: {inserted} registros insertados, "
+        f"{saved - inserted} actualizados, "
+        f"{len(rows) - len(changed_rows)} sin cambios"
+    )
+    return saved + len(rows) - len(changed_rows)
+
+
+def _partition_forecast_rows(rows: List[tuple]) -> Tuple[List[tuple], List[tuple]]:
+    """
+    Separa las filas de pronóstico nuevas o con datos distintos a los guardados.
     
-    conn.commit()
-    conn.close()
+    Una sola consulta trae los registros existentes de las estaciones y fechas
+    del lote; retrieved_at no se compara.
+    
+    Args:
+        rows: Tuplas en el orden de _FORECAST_UPSERT_SQL
+        
+    Returns:
+        Tuple (filas que hay que insertar o actualizar, filas sin cambios)
+    """
+    if not rows:
+        return rows, []
     
-    logger.info(f" Pronósticos guardados: {inserted} nuevos, {updated} actualizados")
-    return inserted + updated
+    station_ids = list({row[0] for row in rows})
+    dates = list({row[6] for row in rows})
+    
+    conn = _connect()
+    cursor = conn.execute(f"""
+        SELECT {", ".join(_FORECAST_DATA_COLUMNS)}
+        FROM weather_forecast
+        WHERE station_id IN ({",".join("?" * len(station_ids))})
+        AND forecast_date IN ({",".join("?" * len(dates))})
+    """, (*station_ids, *dates))
+    
+    existing = {(row[0], row[6]): row for row in cursor.fetchall()}
+    
+    changed, unchanged = [], []
+    for row in rows:
+        (unchanged if existing.get((row[0], row[6])) == row[:-1] else changed).append(row)
+    return changed, unchanged
 
 
-def get_forecast_by_station(station_id: int, days: int = 7) -> List[Dict]:
+def get_forecast_by_station(station_id: int, days: int = 7, as_dict: bool = True) -> List[Dict]:
     """
     Obtiene pronóstico de los próximos N días para una estación.
-    Si no hay datos válidos para hoy/mañana (probabilidades = 0.0), usa los datos 
-    más recientes disponibles con riesgos calculados (fallback).
+    Se resuelve con el índice de UNIQUE(station_id, forecast_date).
     
     Args:
         station_id: ID de la estación
         days: Número de días a obtener (default: 7)
+        as_dict: Si es False, devuelve los sqlite3.Row sin convertir (acceso por
+                 nombre o índice, sin crear un dict por fila; riesgo en risk_bits)
         
     Returns:
         Lista de pronósticos ordenados por fecha
@@ -746,7 +1401,7 @@ def get_forecast_by_station(station_id: int, days: int = 7) -> List[Dict]:
     from datetime import date as date_module
     today = date_module.today().isoformat()
     
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = _connect()
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -760,16 +1415,13 @@ def get_forecast_by_station(station_id: int, days: int = 7) -> List[Dict]:
     """, (station_id, today, days))
     
     rows = cursor.fetchall()
-    conn.close()
     
-    return [dict(row) for row in rows]
+    return [_forecast_record(row) for row in rows] if as_dict else rows
 
 
 def get_all_forecasts(days: int = 7) -> Dict[int, List[Dict]]:
     """
-    Obtiene pronósticos de todas las estaciones agrupados por station_id.
-    Si no hay datos válidos para hoy/mañana (probabilidades = 0.0), usa los datos 
-    más recientes disponibles con riesgos calculados (fallback).
+    Obtiene pronósticos de todas las estaciones (desde hoy) agrupados por station_id.
     
     Args:
         days: Número de días a obtener (default: 7)
@@ -780,7 +1432,7 @@ def get_all_forecasts(days: int = 7) -> Dict[int, List[Dict]]:
     from datetime import date as date_module
     today = date_module.today().isoformat()
     
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = _connect()
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -792,7 +1444,6 @@ def get_all_forecasts(days: int = 7) -> Dict[int, List[Dict]]:
     """, (today,))
     
     rows = cursor.fetchall()
-    conn.close()
     
     # Agrupar por estación
     forecasts_by_station = {}
@@ -800,7 +1451,7 @@ def get_all_forecasts(days: int = 7) -> Dict[int, List[Dict]]:
         station_id = row["station_id"]
         if station_id not in forecasts_by_station:
             forecasts_by_station[station_id] = []
-        forecasts_by_station[station_id].append(dict(row))
+        forecasts_by_station[station_id].append(_forecast_record(row))
     
     # Limitar a N días por estación
     for station_id in forecasts_by_station:
@@ -809,6 +1460,53 @@ def get_all_forecasts(days: int = 7) -> Dict[int, List[Dict]]:
     return forecasts_by_station
 
 
+def get_forecast_matrix(station_id: Optional[int] = None, days: int = 7) -> np.ndarray:
+    """
+    Obtiene los pronósticos (desde hoy) como arreglo estructurado de NumPy.
+    
+    Para consumidores internos que hacen cálculo numérico: las filas se leen como
+    tuplas y se convierten en bloque, sin crear un dict por fila. Las respuestas
+    REST siguen usando get_forecast_by_station / get_all_forecasts.
+    
+    Args:
+        station_id: ID de la estación; None para todas las estaciones
+        days: Número de días por estación (default: 7)
+        
+    Returns:
+        Arreglo con dtype _FORECAST_MATRIX_DTYPE ordenado por estación y fecha
+        (riesgo empaquetado en risk_bits, NULL numérico como NaN)
+    """
+    from datetime import date as date_module
+    today = date_module.today().isoformat()
+    
+    conn = _connect()
+    cursor = conn.cursor()
+    cursor.arraysize = 1000
+    
+    if station_id is None:
+        cursor.execute(f"""
+            SELECT {_FORECAST_MATRIX_COLUMNS} FROM (
+                SELECT *, ROW_NUMBER() OVER (
+                    PARTITION BY station_id ORDER BY forecast_date
+                ) AS row_num
+                FROM weather_forecast
+                WHERE forecast_date >= ?
+            )
+            WHERE row_num <= ?
+            ORDER BY station_id, forecast_date
+        """, (today, days))
+    else:
+        cursor.execute(f"""
+            SELECT {_FORECAST_MATRIX_COLUMNS} FROM weather_forecast
+            WHERE station_id = ?
+            AND forecast_date >= ?
+            ORDER BY forecast_date ASC
+            LIMIT ?
+        """, (station_id, today, days))
+    
+    return np.asarray(cursor.fetchall(), dtype=_FORECAST_MATRIX_DTYPE)
+
+
 def upsert_alert(station_id: int, station_name: str, alert_type: str, 
                  risk_level: str, probability: float) -> None:
     """
@@ -821,35 +1519,42 @@ def upsert_alert(station_id: int, station_name: str, alert_type: str,
         risk_level: Nivel de riesgo ('YELLOW' o 'RED')
         probability: Probabilidad del riesgo (0.0 - 1.0)
     """
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    now = datetime.now(timezone.utc).isoformat()
+    upsert_alerts_bulk([(station_id, station_name, alert_type, risk_level, probability)])
+
+
+def upsert_alerts_bulk(alerts: List[Tuple[int, str, str, str, float]]) -> int:
+    """
+    Crea o actualiza varias alertas activas en una sola transacción.
     
-    # Verificar si ya existe una alerta para esta estación y tipo
-    cursor.execute("""
-        SELECT id, triggered_at FROM active_alerts
-        WHERE station_id = ? AND alert_type = ?
-    """, (station_id, alert_type))
+    Args:
+        alerts: Tuplas (station_id, station_name, alert_type, risk_level, probability)
+        
+    Returns:
+        Número de alertas creadas/actualizadas
+    """
+    if not alerts:
+        return 0
     
-    existing = cursor.fetchone()
+    conn = _connect()
+    now = datetime.now(timezone.utc).isoformat()
     
-    if existing:
-        # Actualizar alerta existente (mantener triggered_at original)
-        cursor.execute("""
-            UPDATE active_alerts
-            SET risk_level = ?, probability = ?, updated_at = ?, station_name = ?
-            WHERE station_id = ? AND alert_type = ?
-        """, (risk_level, probability, now, station_name, station_id, alert_type))
-    else:
-        # Crear nueva alerta
-        cursor.execute("""
+    # Una sola sentencia por alerta: si ya existe se actualiza (manteniendo triggered_at original)
+    with conn:
+        # IMMEDIATE: el lock de escritura se toma al inicio, no a mitad del lote
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany("""
             INSERT INTO active_alerts 
             (station_id, station_name, alert_type, risk_level, probability, triggered_at, updated_at)
             VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (station_id, station_name, alert_type, risk_level, probability, now, now))
-    
-    conn.commit()
-    conn.close()
+            ON CONFLICT(station_id, alert_type) DO UPDATE SET
+                risk_level = excluded.risk_level,
+                probability = excluded.probability,
+                updated_at = excluded.updated_at,
+                station_name = excluded.station_name
+        """, [(*alert, now, now) for alert in alerts])
+    _bump_alerts_version()
+    
+    return len(alerts)
 
 
 def remove_alert(station_id: int, alert_type: str) -> None:
@@ -860,16 +1565,34 @@ def remove_alert(station_id: int, alert_type: str) -> None:
         station_id: ID de la estación
         alert_type: Tipo de alerta ('flood' o 'drought')
     """
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+    remove_alerts_bulk([(station_id, alert_type)])
+
+
+def remove_alerts_bulk(alerts: List[Tuple[int, str]]) -> None:
+    """
+    Elimina varias alertas activas en una sola transacción.
     
-    cursor.execute("""
-        DELETE FROM active_alerts
-        WHERE station_id = ? AND alert_type = ?
-    """, (station_id, alert_type))
+    Args:
+        alerts: Tuplas (station_id, alert_type)
+    """
+    if not alerts:
+        return
     
-    conn.commit()
-    conn.close()
+    conn = _connect()
+    
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany("""
+            DELETE FROM active_alerts
+            WHERE station_id = ? AND alert_type = ?
+        """, alerts)
+    _bump_alerts_version()
+
+
+def _bump_alerts_version() -> None:
+    """Marca active_alerts como modificada (invalida get_all_alerts_by_station)."""
+    global _alerts_version
+    _alerts_version += 1
 
 
 def get_active_alerts(alert_type: Optional[str] = None) -> List[Dict]:
@@ -882,7 +1605,7 @@ def get_active_alerts(alert_type: Optional[str] = None) -> List[Dict]:
     Returns:
         Lista de alertas activas
     """
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = _connect()
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -899,15 +1622,45 @@ def get_active_alerts(alert_type: Optional[str] = None) -> List[Dict]:
         """)
     
     rows = cursor.fetchall()
-    conn.close()
     
     return [dict(row) for row in rows]
 
 
+def get_active_alerts_df(alert_type: Optional[str] = None) -> pd.DataFrame:
+    """
+    Obtiene las alertas activas como DataFrame (para consumidores en pandas/ML).
+    
+    pandas arma las columnas directamente desde el cursor, sin un dict por fila.
+    
+    Args:
+        alert_type: Filtrar por tipo ('flood' o 'drought'), None para todas
+        
+    Returns:
+        DataFrame con el mismo orden que get_active_alerts; probability en
+        float32 y alert_type/risk_level como categorías
+    """
+    conn = _connect()
+    
+    where_clause = "WHERE alert_type = ?" if alert_type else ""
+    df = pd.read_sql_query(f"""
+        SELECT * FROM active_alerts
+        {where_clause}
+        ORDER BY probability DESC, triggered_at DESC
+    """, conn, params=(alert_type,) if alert_type else None)
+    
+    return df.astype({
+        "probability": np.float32,
+        "alert_type": "category",
+        "risk_level": "category",
+    })
+
+
 def get_station_alert(station_id: int, alert_type: str) -> Optional[Dict]:
     """
     Obtiene la alerta de una estación específica.
     
+    Se lee de get_all_alerts_by_station (en caché), sin consulta por estación.
+    
     Args:
         station_id: ID de la estación
         alert_type: Tipo de alerta ('flood' o 'drought')
@@ -915,49 +1668,51 @@ def get_station_alert(station_id: int, alert_type: str) -> Optional[Dict]:
     Returns:
         Alerta si existe, None si no
     """
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT * FROM active_alerts
-        WHERE station_id = ? AND alert_type = ?
-    """, (station_id, alert_type))
-    
-    row = cursor.fetchone()
-    conn.close()
+    alert = get_all_alerts_by_station().get(station_id, {}).get(alert_type)
     
-    return dict(row) if row else None
+    return dict(alert) if alert else None
 
 
 def get_all_alerts_by_station() -> Dict[int, Dict[str, Dict]]:
     """
     Obtiene TODAS las alertas agrupadas por estación para evitar consultas individuales.
     
+    El resultado se reutiliza hasta la siguiente escritura en active_alerts desde
+    este proceso (upsert_alerts_bulk / remove_alerts_bulk); no se debe modificar.
+    
     Returns:
         Dict con estructura: {station_id: {'flood': {...}, 'drought': {...}}}
     """
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
+    return _load_alerts_by_station(_alerts_version, DATABASE_PATH)
+
+
+@lru_cache(maxsize=1)
+def _load_alerts_by_station(version: int, database_path: Path) -> Dict[int, Dict[str, Dict]]:
+    """Consulta active_alerts agrupadas por estación (clave de caché: versión y BD)."""
+    conn = _connect()
     cursor = conn.cursor()
     
+    # Tuplas planas con columnas en orden conocido (sin sqlite3.Row ni dict(row))
     cursor.execute("""
-        SELECT * FROM active_alerts
+        SELECT id, station_id, station_name, alert_type, risk_level,
+               probability, triggered_at, updated_at
+        FROM active_alerts
     """)
     
-    rows = cursor.fetchall()
-    conn.close()
-    
     # Agrupar por estación
     alerts_map = {}
-    for row in rows:
-        station_id = row['station_id']
-        alert_type = row['alert_type']
-        
-        if station_id not in alerts_map:
-            alerts_map[station_id] = {}
-        
-        alerts_map[station_id][alert_type] = dict(row)
+    for alert_id, station_id, station_name, alert_type, risk_level, \
+            probability, triggered_at, updated_at in cursor:
+        alerts_map.setdefault(station_id, {})[alert_type] = {
+            "id": alert_id,
+            "station_id": station_id,
+            "station_name": station_name,
+            "alert_type": alert_type,
+            "risk_level": risk_level,
+            "probability": probability,
+            "triggered_at": triggered_at,
+            "updated_at": updated_at,
+        }
     
     return alerts_map
 
@@ -4,14 +4,75 @@ Permite usar reportes reales de usuarios para entrenar el modelo ML.
 """
 
 import logging
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import List, Dict, Tuple
+from math import radians, sin, cos, sqrt, atan2
+import numpy as np
 import pandas as pd
 
-from core.database.raindrop_db import get_all_incident_reports, get_data_by_date_range
+try:
+    from numba import njit
+except ImportError:  # numba es opcional: sin él se usa la versión con math
+    njit = None
+
+from config import STATIONS
+from core.database.raindrop_db import get_all_incident_reports, iter_data_by_station_windows
 
 logger = logging.getLogger(__name__)
 
+# Ventana alrededor del reporte para buscar la lectura meteorológica (+/- 1 hora)
+INCIDENT_WEATHER_WINDOW = timedelta(hours=1)
+
+# Margen del prefiltro SQL: date_hour_key está en la hora local del timestamp
+# de la estación, reported_at en UTC
+_KEY_RANGE_MARGIN = timedelta(days=1)
+
+# Severidad base del incidente como valor numérico
+SEVERITY_MAP = {'low': 0.3, 'medium': 0.6, 'high': 0.9}
+
+# Features meteorológicas de weather_hourly y su valor si falta el dato
+_WEATHER_FEATURE_DEFAULTS = {
+    'temperature': 0.0,
+    'humidity': 0.0,
+    'precipitation_total': 0.0,
+    'wind_speed': 0.0,
+    'pressure': 1013.0,
+}
+
+# Columnas leídas de weather_hourly para la correlación, en orden
+_WEATHER_COLUMNS = ('station_id', 'timestamp', *_WEATHER_FEATURE_DEFAULTS)
+
+
+def _date_hour_keys(timestamps: pd.Series) -> np.ndarray:
+    """Convierte timestamps al entero YYYYMMDDHH de weather_hourly.date_hour_key"""
+    return timestamps.dt.strftime('%Y%m%d%H').astype(np.int64).to_numpy()
+
+
+def _merge_windows(
+    station_ids: np.ndarray,
+    start_keys: np.ndarray,
+    end_keys: np.ndarray
+) -> List[Tuple[int, int, int]]:
+    """
+    Une las ventanas (estación, inicio, fin) que se solapan dentro de cada estación.
+    
+    Returns:
+        Lista de tuplas (station_id, start_key, end_key) sin solapamientos,
+        ordenadas por estación e inicio
+    """
+    order = np.lexsort((start_keys, station_ids))
+    merged = []
+    for station_id, start, end in zip(
+        station_ids[order].tolist(), start_keys[order].tolist(), end_keys[order].tolist()
+    ):
+        last = merged[-1] if merged else None
+        if last is not None and last[0] == station_id and start <= last[2]:
+            last[2] = max(last[2], end)
+        else:
+            merged.append([station_id, start, end])
+    
+    return [tuple(window) for window in merged]
+
 
 def get_incident_training_data() -> Tuple[pd.DataFrame, pd.Series, pd.Series]:
     """
@@ -20,6 +81,10 @@ def get_incident_training_data() -> Tuple[pd.DataFrame, pd.Series, pd.Series]:
     Correlaciona cada incidente con MÚLTIPLES estaciones cercanas (radio 50km).
     El impacto disminuye con la distancia (decaimiento gaussiano).
     
+    Los datos meteorológicos de todos los pares (incidente, estación) se leen en
+    una sola consulta y se asocian con merge_asof a la lectura más cercana al
+    reporte, dentro de INCIDENT_WEATHER_WINDOW.
+    
     Returns:
         Tuple con (features_df, flood_labels, drought_labels)
     """
@@ -34,96 +99,141 @@ def get_incident_training_data() -> Tuple[pd.DataFrame, pd.Series, pd.Series]:
     
     logger.info(f"📍 Encontrados {len(incidents)} incidentes reportados")
     
-    # Importar función para encontrar estaciones cercanas
-    from config import STATIONS
-    
-    training_samples = []
-    total_correlations = 0
-    
-    for incident in incidents:
-        try:
-            # Encontrar TODAS las estaciones dentro del radio de influencia (50km)
-            nearby_stations = find_nearby_stations(
-                incident['latitude'],
-                incident['longitude'],
-                STATIONS,
-                max_distance_km=50
-            )
-            
-            if not nearby_stations:
-                logger.debug(f"Incidente {incident['id']} muy lejos de todas las estaciones (>50km)")
-                continue
-            
-            # Obtener datos meteorológicos del momento del reporte
-            # Usamos ventana de +/- 1 hora para capturar condiciones
-            reported_at = datetime.fromisoformat(incident['reported_at'].replace('Z', '+00:00'))
-            start_time = reported_at - timedelta(hours=1)
-            end_time = reported_at + timedelta(hours=1)
-            
-            # Convertir severidad base a valor numérico
-            severity_map = {'low': 0.3, 'medium': 0.6, 'high': 0.9}
-            base_severity = severity_map.get(incident.get('severity', 'medium'), 0.6)
-            
-            # Crear una muestra para CADA estación cercana con impacto proporcional
-            for station_id, distance in nearby_stations:
-                # Calcular factor de decaimiento basado en distancia
-                # Fórmula gaussiana: impact = base_severity * exp(-(distance/20)^2)
-                # Esto da: 0km=100%, 10km=78%, 20km=37%, 30km=11%, 40km=2%, 50km=0.3%
-                import math
-                distance_factor = math.exp(-(distance / 20) ** 2)
-                adjusted_severity = base_severity * distance_factor
-                
-                # Obtener datos meteorológicos de esta estación
-                weather_data = get_data_by_date_range(
-                    station_id=station_id,
-                    start_date=start_time.isoformat(),
-                    end_date=end_time.isoformat()
-                )
-                
-                if not weather_data:
-                    logger.debug(f"No hay datos para estación {station_id} en incidente {incident['id']}")
-                    continue
-                
-                # Usar el dato más cercano al momento del reporte
-                weather_record = weather_data[0]
-                
-                # Crear etiquetas: solo el tipo de incidente reportado tiene valor
-                flood_label = adjusted_severity if incident['incident_type'] == 'flood' else 0.0
-                drought_label = adjusted_severity if incident['incident_type'] == 'drought' else 0.0
-                
-                # Extraer features meteorológicas
-                sample = {
-                    'temperature': float(weather_record.get('temperature', 0)),
-                    'humidity': float(weather_record.get('humidity', 0)),
-                    'precipitation_total': float(weather_record.get('precipitation_total', 0)),
-                    'wind_speed': float(weather_record.get('wind_speed', 0)),
-                    'pressure': float(weather_record.get('pressure', 1013)),
-                    'temp_change': 0.0,  # No tenemos histórico aquí
-                    'humidity_change': 0.0,
-                    'precip_change': 0.0,
-                    'wind_change': 0.0,
-                    'pressure_change': 0.0,
-                    'flood_risk': flood_label,
-                    'drought_risk': drought_label,
-                    'incident_id': incident['id'],
-                    'station_id': station_id,
-                    'distance_km': distance,
-                    'impact_factor': distance_factor
-                }
-                
-                training_samples.append(sample)
-                total_correlations += 1
-            
-        except Exception as e:
-            logger.warning(f"Error procesando incidente {incident.get('id')}: {e}")
+    # Momento de cada reporte en UTC (sin zona: se asume UTC), parseado en bloque
+    # una sola vez por incidente; inválidos -> NaT
+    reported_times = pd.to_datetime(
+        [incident['reported_at'] for incident in incidents],
+        utc=True, format='ISO8601', errors='coerce'
+    )
+    
+    invalid = reported_times.isna()
+    if invalid.any():
+        logger.warning(
+            f"Incidentes con reported_at inválido: "
+            f"{[incident['id'] for incident, bad in zip(incidents, invalid) if bad]}"
+        )
+    
+    # Estaciones dentro del radio de influencia (50km) de cada incidente, como
+    # arreglos por incidente que se concatenan en un par (incidente, estación) por fila
+    kept_positions, nearby_counts = [], []
+    station_id_chunks, distance_chunks = [], []
+    for position, incident in enumerate(incidents):
+        if invalid[position]:
+            continue
+        
+        nearby_ids, nearby_distances = _nearby_station_arrays(
+            incident['latitude'],
+            incident['longitude'],
+            STATIONS,
+            max_distance_km=50,
+            # Una muestra por estación: el orden no importa
+            sort=False
+        )
+        
+        if not len(nearby_ids):
+            logger.debug(f"Incidente {incident['id']} muy lejos de todas las estaciones (>50km)")
             continue
+        
+        kept_positions.append(position)
+        nearby_counts.append(len(nearby_ids))
+        station_id_chunks.append(nearby_ids)
+        distance_chunks.append(nearby_distances)
+    
+    if not kept_positions:
+        logger.warning("⚠️ No se pudieron correlacionar incidentes con datos meteorológicos")
+        return pd.DataFrame(), pd.Series(dtype=float), pd.Series(dtype=float)
+    
+    # Campos por incidente repetidos una vez por estación cercana
+    pair_positions = np.repeat(np.asarray(kept_positions, dtype=np.intp), nearby_counts)
+    n_incidents = len(incidents)
+    incident_ids = np.fromiter((i['id'] for i in incidents), dtype=np.int32, count=n_incidents)
+    incident_types = np.array([i['incident_type'] for i in incidents], dtype=object)
+    base_severities = np.fromiter(
+        (SEVERITY_MAP.get(i.get('severity', 'medium'), 0.6) for i in incidents),
+        dtype=np.float32, count=n_incidents
+    )
+    
+    # Factor de decaimiento por distancia, en una sola pasada sobre todos los pares
+    # Fórmula gaussiana: impact = base_severity * exp(-(distance/20)^2)
+    # Esto da: 0km=100%, 10km=78%, 20km=37%, 30km=11%, 40km=2%, 50km=0.3%
+    distances = np.concatenate(distance_chunks).astype(np.float32)
+    impact_factors = np.exp(-(distances / np.float32(20)) ** 2)
+    
+    # float32 / int32: precisión suficiente para features y etiquetas, mitad de memoria
+    # (station_id queda en int64: merge_asof de pandas 2.1 falla con claves `by` int32)
+    pairs_df = pd.DataFrame({
+        'incident_id': incident_ids[pair_positions],
+        'incident_type': incident_types[pair_positions],
+        'reported_at': reported_times[pair_positions],
+        'base_severity': base_severities[pair_positions],
+        'station_id': np.concatenate(station_id_chunks).astype(np.int64),
+        'distance_km': distances,
+        'impact_factor': impact_factors,
+    })
+    
+    # Una sola consulta: solo las horas que rodean cada reporte en cada estación
+    # cercana (con margen por la zona horaria de date_hour_key), con las ventanas
+    # solapadas ya unidas; solo las columnas usadas, consumidas del cursor
+    # mientras se construye el DataFrame
+    margin = INCIDENT_WEATHER_WINDOW + _KEY_RANGE_MARGIN
+    windows = _merge_windows(
+        pairs_df['station_id'].to_numpy(),
+        _date_hour_keys(pairs_df['reported_at'] - margin),
+        _date_hour_keys(pairs_df['reported_at'] + margin)
+    )
+    weather_df = pd.DataFrame.from_records(
+        iter_data_by_station_windows(windows, columns=_WEATHER_COLUMNS),
+        columns=_WEATHER_COLUMNS
+    )
     
-    if not training_samples:
+    if weather_df.empty:
         logger.warning("⚠️ No se pudieron correlacionar incidentes con datos meteorológicos")
         return pd.DataFrame(), pd.Series(dtype=float), pd.Series(dtype=float)
     
-    # Convertir a DataFrame
-    df = pd.DataFrame(training_samples)
+    weather_df = pd.DataFrame({
+        # Mismo dtype que pairs_df: merge_asof exige claves `by` idénticas
+        'station_id': weather_df['station_id'].to_numpy(dtype=np.int64),
+        'weather_time': pd.to_datetime(
+            weather_df['timestamp'], utc=True, format='ISO8601', errors='coerce'
+        ),
+        **{
+            feature: pd.to_numeric(weather_df[feature], errors='coerce').astype(np.float32)
+            for feature in _WEATHER_FEATURE_DEFAULTS
+        },
+    })
+    weather_df = weather_df.dropna(subset=['weather_time']).sort_values('weather_time')
+    
+    # Lectura más cercana al reporte, por estación, dentro de la ventana
+    # (merge_asof exige ambos lados ordenados por la clave de tiempo)
+    pairs_df['pair_order'] = np.arange(len(pairs_df))
+    df = pd.merge_asof(
+        pairs_df.sort_values('reported_at'),
+        weather_df,
+        left_on='reported_at',
+        right_on='weather_time',
+        by='station_id',
+        direction='nearest',
+        tolerance=INCIDENT_WEATHER_WINDOW
+    )
+    df = df[df['weather_time'].notna()].sort_values('pair_order', ignore_index=True)
+    
+    if df.empty:
+        logger.warning("⚠️ No se pudieron correlacionar incidentes con datos meteorológicos")
+        return pd.DataFrame(), pd.Series(dtype=float), pd.Series(dtype=float)
+    
+    df = df.fillna(_WEATHER_FEATURE_DEFAULTS)
+    
+    adjusted_severity = df['base_severity'] * df['impact_factor']
+    
+    # Crear etiquetas: solo el tipo de incidente reportado tiene valor
+    df['flood_risk'] = adjusted_severity.where(df['incident_type'] == 'flood', 0.0).astype(np.float32)
+    df['drought_risk'] = adjusted_severity.where(df['incident_type'] == 'drought', 0.0).astype(np.float32)
+    
+    # No tenemos histórico aquí
+    for change in ('temp_change', 'humidity_change', 'precip_change', 'wind_change', 'pressure_change'):
+        df[change] = np.zeros(len(df), dtype=np.float32)
+    
+    total_correlations = len(df)
     
     logger.info(f"✅ Generadas {len(df)} muestras de entrenamiento desde {len(incidents)} incidentes")
     logger.info(f"   - Total correlaciones: {total_correlations} (múltiples estaciones por incidente)")
@@ -139,9 +249,15 @@ def get_incident_training_data() -> Tuple[pd.DataFrame, pd.Series, pd.Series]:
         'humidity_change', 'precip_change', 'wind_change', 'pressure_change'
     ]
     
-    X = df[feature_names]
-    y_flood = df['flood_risk']
-    y_drought = df['drought_risk']
+    # Solo features y etiquetas: sin incident_id/station_id/distance_km/impact_factor.
+    # X como un único bloque float32 contiguo (np.asarray(X) en sklearn no copia)
+    # manteniendo los nombres de columna que usa predict()
+    X = pd.DataFrame(
+        np.ascontiguousarray(df[feature_names].to_numpy(dtype=np.float32)),
+        columns=feature_names
+    )
+    y_flood = pd.Series(df['flood_risk'].to_numpy(dtype=np.float32), name='flood_risk')
+    y_drought = pd.Series(df['drought_risk'].to_numpy(dtype=np.float32), name='drought_risk')
     
     return X, y_flood, y_drought
 
@@ -157,8 +273,11 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     Returns:
         Distancia en kilómetros
     """
-    from math import radians, sin, cos, sqrt, atan2
-    
+    return _haversine_kernel(lat1, lon1, lat2, lon2)
+
+
+def _haversine_scalar(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Haversine escalar con math (también es la fuente del kernel numba)"""
     R = 6371  # Radio de la Tierra en km
     dlat = radians(lat2 - lat1)
     dlon = radians(lon2 - lon1)
@@ -167,11 +286,107 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     return R * c
 
 
+# Kernel escalar: JIT con numba cuando está disponible > Python con math
+_haversine_kernel = (
+    njit(cache=True, fastmath=True)(_haversine_scalar) if njit is not None else _haversine_scalar
+)
+
+
+def _haversine_to_all(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """
+    Fórmula de Haversine vectorizada: distancia desde un punto a varios.
+    
+    Args:
+        lat, lon: Coordenadas del punto
+        lats, lons: Arreglos con las coordenadas de los demás puntos
+        
+    Returns:
+        Arreglo con las distancias en kilómetros
+    """
+    R = 6371  # Radio de la Tierra en km
+    lat_rad = np.radians(lat)
+    lats_rad = np.radians(lats)
+    dlat = lats_rad - lat_rad
+    dlon = np.radians(lons) - np.radians(lon)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat_rad) * np.cos(lats_rad) * np.sin(dlon / 2) ** 2
+    # 2·atan2(√a, √(1-a)) == 2·asin(√a) para a en [0, 1]
+    return 2 * R * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _equirectangular_sq(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """
+    Distancia equirectangular al cuadrado (en radianes²): sin trigonometría por
+    estación, suficiente para ordenar y descartar candidatos cercanos.
+    """
+    dy = np.radians(lats - lat)
+    dx = np.radians(lons - lon) * np.cos(np.radians(lat))
+    return dx * dx + dy * dy
+
+
+# Holgura del prefiltro equirectangular frente a Haversine en find_nearby_stations
+_PREFILTER_MARGIN = 1.1
+
+
+def _build_station_coords(stations: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """IDs, latitudes y longitudes de las estaciones como arreglos alineados"""
+    n = len(stations)
+    ids = np.fromiter((s['id'] for s in stations), dtype=np.int32, count=n)
+    lats = np.fromiter((s['lat'] for s in stations), dtype=np.float64, count=n)
+    lons = np.fromiter((s['lon'] for s in stations), dtype=np.float64, count=n)
+    return ids, lats, lons
+
+
+# Arreglos de config.STATIONS (layout SoA), construidos una sola vez al importar
+_STATION_COORDS = _build_station_coords(STATIONS)
+
+
+def _station_coords(stations: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Arreglos de las estaciones: los precalculados si es config.STATIONS"""
+    if stations is STATIONS:
+        return _STATION_COORDS
+    return _build_station_coords(stations)
+
+
+def _nearby_station_arrays(
+    lat: float,
+    lon: float,
+    stations: List[Dict],
+    max_distance_km: float = 50,
+    sort: bool = True
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Versión en arreglos de find_nearby_stations.
+    
+    Returns:
+        Tuple (ids, distancias_km) de las estaciones dentro del radio,
+        ordenadas por distancia (estable ante empates) si sort=True, o en el
+        orden de stations si no
+    """
+    ids, lats, lons = _station_coords(stations)
+    
+    # Prefiltro barato con radio algo mayor; Haversine solo para los candidatos
+    max_angle = _PREFILTER_MARGIN * max_distance_km / 6371
+    candidates = _equirectangular_sq(lat, lon, lats, lons) <= max_angle * max_angle
+    ids = ids[candidates]
+    distances = _haversine_to_all(lat, lon, lats[candidates], lons[candidates])
+    
+    within = distances <= max_distance_km
+    ids = ids[within]
+    distances = distances[within]
+    
+    if not sort:
+        return ids, distances
+    
+    order = np.argsort(distances, kind='stable')
+    return ids[order], distances[order]
+
+
 def find_nearby_stations(
     lat: float, 
     lon: float, 
     stations: List[Dict],
-    max_distance_km: float = 50
+    max_distance_km: float = 50,
+    sort: bool = True
 ) -> List[Tuple[int, float]]:
     """
     Encuentra TODAS las estaciones dentro de un radio de distancia.
@@ -181,21 +396,13 @@ def find_nearby_stations(
         lon: Longitud del punto
         stations: Lista de estaciones
         max_distance_km: Radio máximo de búsqueda en km
+        sort: Si es False, no ordena (orden de stations) cuando no hace falta
         
     Returns:
         Lista de tuplas (station_id, distance_km) ordenadas por distancia
     """
-    nearby = []
-    
-    for station in stations:
-        distance = haversine_distance(lat, lon, station['lat'], station['lon'])
-        if distance <= max_distance_km:
-            nearby.append((station['id'], distance))
-    
-    # Ordenar por distancia (más cercana primero)
-    nearby.sort(key=lambda x: x[1])
-    
-    return nearby
+    ids, distances = _nearby_station_arrays(lat, lon, stations, max_distance_km, sort)
+    return list(zip(ids.tolist(), distances.tolist()))
 
 
 def find_closest_station(lat: float, lon: float, stations: List[Dict]) -> Tuple[int, float]:
@@ -210,16 +417,16 @@ def find_closest_station(lat: float, lon: float, stations: List[Dict]) -> Tuple[
     Returns:
         Tuple (station_id, distance_km)
     """
-    closest_station_id = None
-    min_distance = float('inf')
+    if not stations:
+        return None, float('inf')
+    
+    ids, lats, lons = _station_coords(stations)
     
-    for station in stations:
-        distance = haversine_distance(lat, lon, station['lat'], station['lon'])
-        if distance < min_distance:
-            min_distance = distance
-            closest_station_id = station['id']
+    # Mínimo por distancia equirectangular; Haversine solo para la ganadora
+    closest = int(np.argmin(_equirectangular_sq(lat, lon, lats, lons)))
+    distance = haversine_distance(lat, lon, float(lats[closest]), float(lons[closest]))
     
-    return closest_station_id, min_distance
+    return int(ids[closest]), distance
 
 
 def get_combined_training_data(use_incidents: bool = True) -> Tuple[pd.DataFrame, pd.Series, pd.Series]:
@@ -1,6 +1,6 @@
 """
 Módulo de Machine Learning para predicción de riesgo climático
-Entrena DOS modelos RandomForestRegressor (inundación y sequía) usando datos históricos
+Entrena DOS modelos HistGradientBoostingRegressor (inundación y sequía) usando datos históricos
 """
 
 from datetime import datetime, timezone, timedelta
@@ -8,15 +8,17 @@ from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import logging
 import joblib
+from joblib import Parallel, delayed
 import numpy as np
 import pandas as pd
 
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.inspection import permutation_importance
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 
 from core.database.raindrop_db import get_data_by_date_range
-from core.analysis.risk_analyzer import RiskAnalyzer, RiskLevel
+from core.analysis.risk_analyzer import RiskAnalyzer
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +27,21 @@ MODELS_DIR = Path(__file__).parent.parent.parent / "ml_models"
 MODELS_DIR.mkdir(exist_ok=True)
 
 
+def _fit_regressor(X_train: pd.DataFrame, y_train: pd.Series, random_state: int) -> HistGradientBoostingRegressor:
+    """Crea y entrena un regresor de riesgo (se ejecuta en un worker de joblib)."""
+    model = HistGradientBoostingRegressor(
+        max_iter=200,
+        max_depth=10,
+        learning_rate=0.05,
+        early_stopping=True,
+        random_state=random_state
+    )
+    return model.fit(X_train, y_train)
+
+
 class RiskPredictor:
     """
-    Predictor de riesgo climático usando RandomForest.
+    Predictor de riesgo climático usando HistGradientBoosting.
     Entrena DOS modelos separados:
     - Modelo de riesgo de inundación (flood_risk: 0.0-1.0)
     - Modelo de riesgo de sequía (drought_risk: 0.0-1.0)
@@ -72,7 +86,8 @@ class RiskPredictor:
         end_date = datetime.now(timezone.utc)
         start_date = datetime(2020, 1, 1, tzinfo=timezone.utc)  # Desde inicio de datos
         
-        all_data = []
+        raw_rows = []
+        station_ids = []
         analyzer = RiskAnalyzer()
         
         # Obtener todas las estaciones desde la DB
@@ -80,56 +95,48 @@ class RiskPredictor:
         stations = get_all_stations()
         logger.info(f"📊 Entrenando con datos de {len(stations)} estaciones")
         
-        # Recopilar datos de todas las estaciones
+        # Recopilar las filas crudas de todas las estaciones (un solo DataFrame al final)
         for station in stations:
             station_id = station['id']
             try:
                 station_data = get_data_by_date_range(
                     start_date=start_date,
                     end_date=end_date,
-                    station_id=station_id
+                    station_id=station_id,
+                    as_dict=False
                 )
-                
-                if len(station_data) < 3:  # Necesitamos al menos 3 registros para calcular cambios
-                    continue
-                
-                # Convertirir a DataFrame para facilitar cálculos
-                df = pd.DataFrame(station_data)
-                
-                # Limpiar valores None antes de calcular cambios
-                # Reemplazar None con el valor anterior o con 0 si no hay valor anterior
-                numeric_columns = ['temperature', 'humidity', 'precipitation_total', 'wind_speed', 'pressure']
-                for col in numeric_columns:
-                    if col in df.columns:
-                        # Convertir a numeric primero para evitar warnings de downcasting
-                        df[col] = pd.to_numeric(df[col], errors='coerce')
-                        # Forward fill primero (usar valor anterior), luego backward fill, finalmente 0
-                        df[col] = df[col].ffill().bfill().fillna(0)
-                
-                # Calcular cambios (tendencias)
-                df['temp_change'] = df['temperature'].diff().fillna(0)
-                df['humidity_change'] = df['humidity'].diff().fillna(0)
-                df['precip_change'] = df['precipitation_total'].diff().fillna(0)
-                df['wind_change'] = df['wind_speed'].diff().fillna(0)
-                df['pressure_change'] = df['pressure'].diff().fillna(0)
-                
-                # Calcular riesgos de inundación y sequía para cada registro
-                for idx, row in df.iterrows():
-                    flood_risk, drought_risk = self._calculate_historical_risks(row)
-                    df.at[idx, 'flood_risk'] = flood_risk
-                    df.at[idx, 'drought_risk'] = drought_risk
-                
-                all_data.append(df)
-                
             except Exception as e:
                 logger.warning(f"Error obteniendo datos de estación {station_id}: {e}")
                 continue
+            
+            if len(station_data) < 3:  # Necesitamos al menos 3 registros para calcular cambios
+                continue
+            
+            raw_rows.extend(station_data)
+            station_ids.extend([station_id] * len(station_data))
         
-        if not all_data:
+        if not raw_rows:
             raise ValueError("No hay datos suficientes para entrenamiento")
         
-        # Combinar todos los datos
-        combined_df = pd.concat(all_data, ignore_index=True)
+        # Convertir a DataFrame para facilitar cálculos (filas sqlite3.Row, sin dicts)
+        combined_df = pd.DataFrame.from_records(raw_rows, columns=raw_rows[0].keys())
+        combined_df['station_id'] = station_ids
+        
+        # Limpiar valores None antes de calcular cambios, sin mezclar estaciones:
+        # valor anterior de la misma estación, luego el siguiente, finalmente 0
+        numeric_columns = ['temperature', 'humidity', 'precipitation_total', 'wind_speed', 'pressure']
+        station_key = combined_df['station_id']
+        numeric = combined_df[numeric_columns].apply(pd.to_numeric, errors='coerce')
+        numeric = numeric.groupby(station_key, sort=False).ffill()
+        numeric = numeric.groupby(station_key, sort=False).bfill().fillna(0)
+        combined_df[numeric_columns] = numeric
+        
+        # Calcular cambios (tendencias) dentro de cada estación
+        change_columns = ['temp_change', 'humidity_change', 'precip_change', 'wind_change', 'pressure_change']
+        combined_df[change_columns] = numeric.groupby(station_key, sort=False).diff().fillna(0).to_numpy()
+        
+        # Calcular riesgos de inundación y sequía de todos los registros a la vez
+        combined_df['flood_risk'], combined_df['drought_risk'] = self._calculate_historical_risks_vectorized(combined_df)
         
         # Eliminar filas con valores nulos en features críticos
         combined_df = combined_df.dropna(subset=self.feature_names + ['flood_risk', 'drought_risk'])
@@ -247,6 +254,64 @@ class RiskPredictor:
         
         return flood_risk, drought_risk
     
+    @staticmethod
+    def _calculate_historical_risks_vectorized(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Versión vectorizada de _calculate_historical_risks para todas las filas.
+        
+        Cada bloque if/elif es un np.select (la primera condición que se cumple
+        gana) y los puntajes se suman en el mismo orden que la versión por fila.
+        
+        Args:
+            df: DataFrame con temperature, humidity, precipitation_total,
+                wind_speed y pressure (sin nulos)
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (flood_risk, drought_risk) en rango [0.0, 1.0]
+        """
+        precip = df['precipitation_total'].to_numpy(dtype=np.float64)
+        humidity = df['humidity'].to_numpy(dtype=np.float64)
+        pressure = df['pressure'].to_numpy(dtype=np.float64)
+        wind = df['wind_speed'].to_numpy(dtype=np.float64)
+        temp = df['temperature'].to_numpy(dtype=np.float64)
+        
+        # ===== FLOOD RISK CALCULATION =====
+        flood_score = (
+            # Precipitación (peso: 40%)
+            np.select([precip > 50, precip > 25, precip > 10, precip > 5],
+                      [0.40, 0.30, 0.15, 0.05], default=0.0)
+            # Humedad alta (peso: 20%)
+            + np.select([humidity > 90, humidity > 85, humidity > 75],
+                        [0.20, 0.15, 0.10], default=0.0)
+            # Presión baja indica tormentas (peso: 20%)
+            + np.select([pressure < 1000, pressure < 1005, pressure < 1010],
+                        [0.20, 0.15, 0.08], default=0.0)
+            # Viento fuerte (peso: 10%)
+            + np.select([wind > 50, wind > 30], [0.10, 0.05], default=0.0)
+            # Temperatura (peso: 10% - tormentas tropicales)
+            + np.select([(temp >= 25) & (temp <= 35), (temp >= 20) & (temp < 25)],
+                        [0.10, 0.05], default=0.0)
+        )
+        
+        # ===== DROUGHT RISK CALCULATION =====
+        drought_score = (
+            # Precipitación baja (peso: 40%)
+            np.select([precip < 1, precip < 2, precip < 5],
+                      [0.40, 0.30, 0.15], default=0.0)
+            # Humedad baja (peso: 25%)
+            + np.select([humidity < 30, humidity < 40, humidity < 50],
+                        [0.25, 0.20, 0.10], default=0.0)
+            # Temperatura alta (peso: 20%)
+            + np.select([temp > 38, temp > 35, temp > 32],
+                        [0.20, 0.15, 0.10], default=0.0)
+            # Presión alta (peso: 15% - sistema anticiclónico)
+            + np.select([pressure > 1020, pressure > 1015, pressure > 1013],
+                        [0.15, 0.10, 0.05], default=0.0)
+        )
+        
+        # Limitar a [0.0, 1.0]
+        return np.minimum(flood_score, 1.0), np.minimum(drought_score, 1.0)
+    
     def train(
         self, 
         days_back: int = 7,
@@ -282,6 +347,11 @@ class RiskPredictor:
             # Método sintético original
             X, y_flood, y_drought = self.prepare_training_data(days_back=days_back)
         
+        # float32: la mitad de memoria que mover en el entrenamiento (sin copia si ya lo son)
+        X = X.astype(np.float32, copy=False)
+        y_flood = y_flood.astype(np.float32, copy=False)
+        y_drought = y_drought.astype(np.float32, copy=False)
+        
         # Dividir entrenamiento/prueba
         X_train, X_test, y_flood_train, y_flood_test, y_drought_train, y_drought_test = train_test_split(
             X, y_flood, y_drought, test_size=test_size, random_state=random_state
@@ -289,17 +359,14 @@ class RiskPredictor:
         
         logger.info(f"📊 Train: {len(X_train):,} muestras | Test: {len(X_test):,} muestras")
         
-        # ===== ENTRENAR MODELO DE FLOOD =====
-        logger.info("🌊 Entrenando modelo de FLOOD...")
-        self.flood_model = RandomForestRegressor(
-            n_estimators=100,
-            max_depth=15,
-            min_samples_split=5,
-            min_samples_leaf=2,
-            random_state=random_state,
-            n_jobs=-1
+        # ===== ENTRENAR MODELOS DE FLOOD Y DROUGHT EN PARALELO =====
+        # Son independientes: cada uno en su proceso (loky reparte los hilos
+        # de OpenMP entre ambos para no sobresuscribir la CPU)
+        logger.info("🌊☀️ Entrenando modelos de FLOOD y DROUGHT en paralelo...")
+        self.flood_model, self.drought_model = Parallel(n_jobs=2, backend='loky')(
+            delayed(_fit_regressor)(X_train, y_train, random_state)
+            for y_train in (y_flood_train, y_drought_train)
         )
-        self.flood_model.fit(X_train, y_flood_train)
         
         # Evaluar flood model
         y_flood_pred = self.flood_model.predict(X_test)
@@ -307,18 +374,6 @@ class RiskPredictor:
         flood_mae = mean_absolute_error(y_flood_test, y_flood_pred)
         flood_r2 = r2_score(y_flood_test, y_flood_pred)
         
-        # ===== ENTRENAR MODELO DE DROUGHT =====
-        logger.info("☀️ Entrenando modelo de DROUGHT...")
-        self.drought_model = RandomForestRegressor(
-            n_estimators=100,
-            max_depth=15,
-            min_samples_split=5,
-            min_samples_leaf=2,
-            random_state=random_state,
-            n_jobs=-1
-        )
-        self.drought_model.fit(X_train, y_drought_train)
-        
         # Evaluar drought model
         y_drought_pred = self.drought_model.predict(X_test)
         drought_mse = mean_squared_error(y_drought_test, y_drought_pred)
@@ -326,8 +381,9 @@ class RiskPredictor:
         drought_r2 = r2_score(y_drought_test, y_drought_pred)
         
         # Importancia de características para cada modelo
-        flood_importance = dict(zip(self.feature_names, self.flood_model.feature_importances_))
-        drought_importance = dict(zip(self.feature_names, self.drought_model.feature_importances_))
+        # (HistGradientBoosting no expone feature_importances_, se mide por permutación)
+        flood_importance = self._permutation_importance(self.flood_model, X_test, y_flood_test, random_state)
+        drought_importance = self._permutation_importance(self.drought_model, X_test, y_drought_test, random_state)
         
         sorted_flood = sorted(flood_importance.items(), key=lambda x: x[1], reverse=True)
         sorted_drought = sorted(drought_importance.items(), key=lambda x: x[1], reverse=True)
@@ -377,6 +433,39 @@ class RiskPredictor:
         
         return metrics
     
+    def _permutation_importance(
+        self,
+        model,
+        X_test: pd.DataFrame,
+        y_test: pd.Series,
+        random_state: int,
+        max_samples: int = 5000
+    ) -> Dict[str, float]:
+        """
+        Importancia de cada feature como caída media de R² al permutarla.
+        
+        Args:
+            model: Modelo ya entrenado
+            X_test: Features de prueba
+            y_test: Objetivo de prueba
+            random_state: Semilla para reproducibilidad
+            max_samples: Máximo de filas de prueba usadas por repetición
+            
+        Returns:
+            Dict {feature: importancia}
+        """
+        result = permutation_importance(
+            model, X_test, y_test,
+            n_repeats=5,
+            max_samples=min(max_samples, len(X_test)),
+            random_state=random_state,
+            n_jobs=-1
+        )
+        return {
+            name: float(importance)
+            for name, importance in zip(self.feature_names, result.importances_mean)
+        }
+    
     def predict(self, features: Dict) -> Dict:
         """
         Predice los niveles de riesgo de inundación y sequía para nuevas features.
@@ -402,7 +491,7 @@ class RiskPredictor:
             'precip_change': features.get('precip_change', 0),
             'wind_change': features.get('wind_change', 0),
             'pressure_change': features.get('pressure_change', 0)
-        }], columns=self.feature_names)
+        }], columns=self.feature_names, dtype=np.float32)
         
         # Predecir con ambos modelos
         flood_risk = float(self.flood_model.predict(X)[0])
@@ -24,7 +24,7 @@ from datetime import datetime, timedelta
 # ============================================================
 from config import (
     FEATURE_COLUMNS,
-    MASTER_DATASET,
+    MASTER_DATASET_PATH,
     DATA_CLEAN_PATH
 )
 
@@ -40,7 +40,7 @@ random.seed(42)
 START_DATE = datetime(2020, 1, 1)
 END_DATE   = datetime(2025, 1, 1)   # 5 años
 N_STATIONS = 253                    # ajustado para ~11.1M
-OUTPUT_FILE = DATA_CLEAN_PATH / MASTER_DATASET
+OUTPUT_FILE = MASTER_DATASET_PATH
 
 # ============================================================
 # REGIONES DE PANAMÁ Y FACTOR DE LLUVIA
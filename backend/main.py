@@ -10,7 +10,7 @@ import logging
 from pathlib import Path
 
 from core.scheduler import start_scheduler, stop_scheduler
-from core.database.raindrop_db import init_database
+from core.database.raindrop_db import init_database, close_connection
 from api import health_router, stations_router, predictions_router, pipelines_router, risk_router, ml_router, incidents_router
 from api.forecast import router as forecast_router
 
@@ -58,6 +58,7 @@ async def lifespan(app: FastAPI):
     logger.info(" Deteniendo rAIndrop Backend...")
     stop_scheduler()
     logger.info(" Scheduler detenido")
+    close_connection()
 
 
 # Crear app FastAPI
@@ -10,7 +10,7 @@ backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
 
 import sqlite3
-from core.database.raindrop_db import DATABASE_PATH
+from core.database.raindrop_db import DATABASE_PATH, encode_risk_bits
 from core.ml.risk_predictor import RiskPredictor
 
 def populate_risks():
@@ -97,15 +97,12 @@ def populate_risks():
             cursor.execute("""
                 UPDATE weather_forecast
                 SET flood_probability = ?,
-                    flood_level = ?,
-                    flood_alert = ?,
                     drought_probability = ?,
-                    drought_level = ?,
-                    drought_alert = ?
+                    risk_bits = ?
                 WHERE station_id = ? AND forecast_date = ?
             """, (
-                flood_prob, flood_level, flood_alert,
-                drought_prob, drought_level, drought_alert,
+                flood_prob, drought_prob,
+                encode_risk_bits(flood_level, flood_alert, drought_level, drought_alert),
                 f_dict.get('station_id'), f_dict.get('forecast_date')
             ))
             
@@ -0,0 +1,40 @@
+"""
+Script para compilar por adelantado (AOT) el kernel de clasificación de riesgo
+
+Genera core/analysis/risk_kernel.*.so con numba.pycc. core/analysis/risk_analyzer.py
+lo importa si existe, evitando la compilación JIT en cada worker.
+Requiere numba y un compilador de C.
+"""
+
+import sys
+from pathlib import Path
+
+from numba.pycc import CC
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.analysis import risk_analyzer  # noqa: E402
+
+OUTPUT_DIR = Path(__file__).parent.parent / "core" / "analysis"
+
+# current, historical, bordes, n_bordes, lado izquierdo, scores por tramo, scores, tramos
+SIGNATURE = "void(f8[:, ::1], f8[:, ::1], f8[:, ::1], i8[::1], b1[::1], i8[:, ::1], i8[:, ::1], i8[:, ::1])"
+
+
+def build_risk_kernel(output_dir: Path = OUTPUT_DIR) -> None:
+    """
+    Compila risk_analyzer._score_kernel como extensión nativa risk_kernel.
+    
+    Args:
+        output_dir: Directorio donde se genera la extensión
+    """
+    cc = CC("risk_kernel")
+    cc.output_dir = str(output_dir)
+    cc.export("score_kernel", SIGNATURE)(risk_analyzer._score_kernel)
+    cc.compile()
+    
+    print(f"✅ Kernel compilado en: {output_dir}")
+
+
+if __name__ == "__main__":
+    build_risk_kernel()
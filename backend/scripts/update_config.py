@@ -7,13 +7,13 @@ import sys
 from pathlib import Path
 
 def update_config_from_json(json_file: str = "scripts/stations_imhpa.json", 
-                            config_file: str = "config.py"):
+                            config_file: str = "core/data/stations_data.py"):
     """
-    Actualiza config.py con las estaciones del JSON.
+    Actualiza core/data/stations_data.py con las estaciones del JSON.
     
     Args:
         json_file: Archivo JSON con estaciones
-        config_file: Archivo config.py a actualizar
+        config_file: Archivo con el literal STATIONS a actualizar
     """
     # Leer JSON
     with open(json_file, 'r', encoding='utf-8') as f:
@@ -79,7 +79,7 @@ def update_config_from_json(json_file: str = "scripts/stations_imhpa.json",
         for prov, count in sorted(provincias.items()):
             print(f"  {prov}: {count}")
     else:
-        print("❌ No se encontró la variable STATIONS en config.py")
+        print(f"❌ No se encontró la variable STATIONS en {config_file}")
         print("\nAgrega manualmente:")
         print(stations_code)
 
@@ -87,11 +87,11 @@ def update_config_from_json(json_file: str = "scripts/stations_imhpa.json",
 if __name__ == "__main__":
     import argparse
     
-    parser = argparse.ArgumentParser(description="Actualizar config.py con estaciones de IMHPA")
+    parser = argparse.ArgumentParser(description="Actualizar estaciones de IMHPA (core/data/stations_data.py)")
     parser.add_argument("--json", default="scripts/stations_imhpa.json",
                         help="Archivo JSON con estaciones")
-    parser.add_argument("--config", default="config.py",
-                        help="Archivo config.py a actualizar")
+    parser.add_argument("--config", default="core/data/stations_data.py",
+                        help="Archivo con el literal STATIONS a actualizar")
     
     args = parser.parse_args()
     
@@ -5,11 +5,12 @@ Calculates and retrieves model performance metrics
 
 import logging
 import json
+import os
 from pathlib import Path
 from typing import Optional, Dict
 from datetime import datetime
 
-from config import MODELS_PATH, MODEL_METADATA, FEATURE_IMPORTANCES
+from config import MODELS_PATH, MODEL_METADATA_PATH, FEATURE_IMPORTANCES_PATH
 
 logger = logging.getLogger(__name__)
 
@@ -35,8 +36,8 @@ class MetricsCalculator:
         try:
             logger.info(f" Loading metrics for {model_type} model...")
 
-            metadata_file = self.models_path / MODEL_METADATA
-            if not metadata_file.exists():
+            metadata_file = MODEL_METADATA_PATH
+            if not os.path.exists(metadata_file):
                 logger.warning(f" Metadata file not found: {metadata_file}")
                 return None
 
@@ -62,8 +63,8 @@ class MetricsCalculator:
         try:
             logger.info(f" Loading feature importances for {model_type}...")
 
-            importance_file = self.models_path / FEATURE_IMPORTANCES
-            if not importance_file.exists():
+            importance_file = FEATURE_IMPORTANCES_PATH
+            if not os.path.exists(importance_file):
                 logger.warning(f" Feature importances file not found: {importance_file}")
                 return None
 
@@ -8,6 +8,7 @@ import numpy as np
 import logging
 import joblib
 import json
+import os
 from pathlib import Path
 from typing import Optional, Tuple, Dict
 from datetime import datetime
@@ -35,11 +36,11 @@ from config import (
     N_ESTIMATORS,
     MAX_DEPTH,
     MIN_SAMPLES_SPLIT,
-    MASTER_DATASET,
-    MODEL_FLOOD,
-    MODEL_DROUGHT,
-    MODEL_METADATA,
-    FEATURE_IMPORTANCES,
+    MASTER_DATASET_PATH,
+    MODEL_FLOOD_PATH,
+    MODEL_DROUGHT_PATH,
+    MODEL_METADATA_PATH,
+    FEATURE_IMPORTANCES_PATH,
 )
 
 logger = logging.getLogger(__name__)
@@ -61,8 +62,8 @@ class ModelTrainer:
     def load_training_data(self) -> Optional[pd.DataFrame]:
         """Load clean dataset for training"""
         try:
-            data_file = self.data_path / MASTER_DATASET
-            if not data_file.exists():
+            data_file = MASTER_DATASET_PATH
+            if not os.path.exists(data_file):
                 logger.error(f" Training data not found: {data_file}")
                 return None
 
@@ -257,14 +258,14 @@ class ModelTrainer:
             logger.info(" Saving models...")
 
             for model_type, model in self.models.items():
-                model_file = self.models_path / (
-                    MODEL_FLOOD if model_type == "flood" else MODEL_DROUGHT
+                model_file = (
+                    MODEL_FLOOD_PATH if model_type == "flood" else MODEL_DROUGHT_PATH
                 )
                 joblib.dump(model, model_file)
                 logger.info(f"    Saved {model_file}")
 
             # Guardar metadatos
-            metadata_file = self.models_path / MODEL_METADATA
+            metadata_file = MODEL_METADATA_PATH
             with open(metadata_file, "w") as f:
                 json.dump(
                     {
@@ -287,7 +288,7 @@ class ModelTrainer:
                         )
                     }
 
-            importance_file = self.models_path / FEATURE_IMPORTANCES
+            importance_file = FEATURE_IMPORTANCES_PATH
             with open(importance_file, "w") as f:
                 json.dump(importances, f, indent=2)
             logger.info(f"    Saved {importance_file}")
@@ -313,8 +314,8 @@ class ModelTrainer:
     def get_feature_importances(self) -> Optional[Dict]:
         """Get feature importances from trained models"""
         try:
-            importance_file = self.models_path / FEATURE_IMPORTANCES
-            if importance_file.exists():
+            importance_file = FEATURE_IMPORTANCES_PATH
+            if os.path.exists(importance_file):
                 with open(importance_file, "r") as f:
                     return json.load(f)
             return None
@@ -8,6 +8,7 @@ import numpy as np
 import logging
 import joblib
 import json
+import os
 from pathlib import Path
 from typing import Optional, Dict, List
 from datetime import datetime
@@ -17,12 +18,14 @@ from config import (
     MODELS_PATH,
     DATA_CACHE_PATH,
     FEATURE_COLUMNS,
-    MODEL_FLOOD,
-    MODEL_DROUGHT,
-    LATEST_IMHPA,
-    PREDICTIONS_CACHE,
+    MODEL_FLOOD_PATH,
+    MODEL_DROUGHT_PATH,
+    LATEST_IMHPA_PATH,
+    MASTER_DATASET_PATH,
+    PREDICTIONS_CACHE_PATH,
     RISK_LEVELS,
 )
+from .risk_calculator import classify_batch
 
 logger = logging.getLogger(__name__)
 
@@ -45,10 +48,10 @@ class Predictor:
         try:
             logger.info(" Loading models...")
 
-            model_flood_path = self.models_path / MODEL_FLOOD
-            model_drought_path = self.models_path / MODEL_DROUGHT
+            model_flood_path = MODEL_FLOOD_PATH
+            model_drought_path = MODEL_DROUGHT_PATH
 
-            if not model_flood_path.exists() or not model_drought_path.exists():
+            if not os.path.exists(model_flood_path) or not os.path.exists(model_drought_path):
                 logger.error(" Models not found. Train models first.")
                 return False
 
@@ -71,15 +74,15 @@ class Predictor:
             logger.info(" Fetching latest data...")
 
             # Intentar obtener últimos datos de IMHPA
-            imhpa_file = self.data_path / LATEST_IMHPA
-            if imhpa_file.exists():
+            imhpa_file = LATEST_IMHPA_PATH
+            if os.path.exists(imhpa_file):
                 df = pd.read_csv(imhpa_file)
                 logger.info(f"    Using IMHPA data ({len(df)} records)")
                 return df
 
             # Recurrir al conjunto de datos maestro
-            master_file = self.data_path / "master_dataset_final.csv"
-            if master_file.exists():
+            master_file = MASTER_DATASET_PATH
+            if os.path.exists(master_file):
                 df = pd.read_csv(master_file)
                 # Obtener últimos registros por estación
                 df = df.sort_values("date" if "date" in df.columns else 0).drop_duplicates(
@@ -136,12 +139,13 @@ class Predictor:
             # Generar predicciones
             predictions_proba = model.predict_proba(X)[:, 1]
             predictions_class = model.predict(X)
+            risk_levels = classify_batch(predictions_proba, model_type)
 
             # Construir resultados
             results = []
             for idx, row in df.iterrows():
                 prob = float(predictions_proba[idx])
-                risk_level = self._get_risk_level(prob)
+                risk_level = str(risk_levels[idx])
 
                 result = {
                     "station_id": int(row.get("station_id", idx)),
@@ -245,7 +249,7 @@ class Predictor:
     def cache_predictions(self, predictions: Dict) -> bool:
         """Save predictions to cache"""
         try:
-            cache_file = self.cache_path / PREDICTIONS_CACHE
+            cache_file = PREDICTIONS_CACHE_PATH
             with open(cache_file, "w") as f:
                 json.dump(predictions, f, indent=2)
             logger.info(f" Predictions cached")
@@ -257,8 +261,8 @@ class Predictor:
     def get_cached_predictions(self) -> Optional[Dict]:
         """Load predictions from cache"""
         try:
-            cache_file = self.cache_path / PREDICTIONS_CACHE
-            if cache_file.exists():
+            cache_file = PREDICTIONS_CACHE_PATH
+            if os.path.exists(cache_file):
                 with open(cache_file, "r") as f:
                     return json.load(f)
             return None
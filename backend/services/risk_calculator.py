@@ -20,6 +20,31 @@ from config import (
 
 logger = logging.getLogger(__name__)
 
+# Umbrales (bajo, alto) por tipo de riesgo para clasificación vectorizada
+THRESHOLDS = np.array(
+    [
+        [FLOOD_THRESHOLD_LOW, FLOOD_THRESHOLD_HIGH],
+        [DROUGHT_THRESHOLD_LOW, DROUGHT_THRESHOLD_HIGH],
+    ],
+    # float64: misma comparación que _get_risk_level (escalar) en los umbrales
+    dtype=np.float64,
+)
+THRESHOLDS_FLOOD = THRESHOLDS[0]
+THRESHOLDS_DROUGHT = THRESHOLDS[1]
+RISK_NAMES = np.array(["GREEN", "YELLOW", "RED"])
+
+
+def classify_batch(probs, risk_type: str = "flood") -> np.ndarray:
+    """
+    Classify an array of probabilities into GREEN/YELLOW/RED in one pass
+
+    Returns:
+        Array of risk level names aligned with probs
+    """
+    thresholds = THRESHOLDS_DROUGHT if risk_type == "drought" else THRESHOLDS_FLOOD
+    idx = np.searchsorted(thresholds, np.asarray(probs, dtype=np.float64), side="right")
+    return np.take(RISK_NAMES, idx)
+
 
 class RiskCalculator:
     """
@@ -0,0 +1,75 @@
+"""
+Pruebas de la correlación de incidentes con datos meteorológicos
+sobre una base de datos SQLite en memoria.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from config import STATIONS
+from core.database import raindrop_db
+from core.ml.incident_correlation import get_incident_training_data
+
+
+@pytest.fixture
+def memory_db(monkeypatch):
+    """Apunta raindrop_db a una base de datos en memoria con el schema creado."""
+    monkeypatch.setattr(raindrop_db, "DATABASE_PATH", ":memory:")
+    raindrop_db.init_database()
+    yield
+    raindrop_db.close_connection()
+
+
+def _weather_row(station, timestamp):
+    return {
+        'station_id': station['id'],
+        'station_name': station['name'],
+        'region': station['region'],
+        'latitude': station['lat'],
+        'longitude': station['lon'],
+        'elevation': station['elevation'],
+        'timestamp': timestamp.isoformat(),
+        'temperature': 27.0,
+        'humidity': 92.0,
+        'precipitation_total': 30.0,
+        'wind_speed': 12.0,
+        'pressure': 1004.0,
+    }
+
+
+def test_incident_training_data_from_memory_db(memory_db):
+    station = STATIONS[0]
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    raindrop_db.insert_or_update_weather_data([
+        _weather_row(station, now + timedelta(hours=offset)) for offset in (-1, 0, 1)
+    ])
+    raindrop_db.insert_incident_report({
+        'incident_type': 'flood',
+        'description': 'Calle inundada',
+        'latitude': station['lat'],
+        'longitude': station['lon'],
+        'severity': 'high',
+    })
+    
+    X, y_flood, y_drought = get_incident_training_data()
+    
+    # Solo la estación con datos se correlaciona (las demás cercanas no tienen lecturas)
+    assert len(X) == len(y_flood) == len(y_drought) == 1
+    assert list(X.columns) == [
+        'temperature', 'humidity', 'precipitation_total',
+        'wind_speed', 'pressure', 'temp_change',
+        'humidity_change', 'precip_change', 'wind_change', 'pressure_change'
+    ]
+    assert X.dtypes.eq(np.float32).all()
+    assert X.loc[0, 'precipitation_total'] == pytest.approx(30.0)
+    # Incidente sobre la estación: impacto completo de la severidad 'high'
+    assert y_flood[0] == pytest.approx(0.9)
+    assert y_drought[0] == 0.0
+
+
+def test_incident_training_data_without_incidents(memory_db):
+    X, y_flood, y_drought = get_incident_training_data()
+    
+    assert X.empty and y_flood.empty and y_drought.empty